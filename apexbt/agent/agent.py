@@ -81,19 +81,19 @@ class TradeAgent:
         Is this tweet positive or negative regarding this specific token?
         Only mark as NEGATIVE if there's clear negative sentiment."""
 
+        # The prompt never changes, so build the chain once rather than per tweet
+        prompt = ChatPromptTemplate.from_messages(
+            [("system", self.system_prompt), ("human", self.prompt_template)]
+        )
+        self.chain = prompt | self.llm
+
     @retry.Retry()
     def analyze_sentiment(self, tweet_text: str, token: str) -> SentimentAnalysis:
         try:
             # Acquire rate limit token before making the API call
             self.request_rate_limiter.acquire()
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", self.system_prompt), ("human", self.prompt_template)]
-            )
-
-            chain = prompt | self.llm
-
-            response = chain.invoke({"tweet_text": tweet_text, "token": token})
+            response = self.chain.invoke({"tweet_text": tweet_text, "token": token})
 
             try:
                 sentiment, confidence, reasoning = response.content.strip().split("|")
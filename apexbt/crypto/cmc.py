@@ -1,5 +1,4 @@
 import logging
-from requests import Session
 import requests
 from datetime import timedelta, datetime, timezone
 import time
@@ -41,6 +40,9 @@ class RateLimiter:
 
 rate_limiter = RateLimiter()
 
+# Shared across calls so repeated lookups reuse keep-alive connections
+session = requests.Session()
+
 
 def get_crypto_price(ticker, timestamp=None, include_historical=False):
     """
@@ -166,10 +168,7 @@ def get_coinmarketcap_dex_price(ticker):
         "network_id": "199",
     }
 
-    session = Session()
-    session.headers.update(headers)
-
-    response = session.get(url, params=parameters)
+    response = session.get(url, headers=headers, params=parameters)
     data = response.json()
 
     if response.status_code == 200 and data.get("data"):
@@ -214,10 +213,7 @@ def get_coinmarketcap_standard_price(ticker):
 
         info_params = {"symbol": ticker}
 
-        session = Session()
-        session.headers.update(headers)
-
-        info_response = session.get(info_url, params=info_params)
+        info_response = session.get(info_url, headers=headers, params=info_params)
         info_data = info_response.json()
 
         # Log info response
@@ -269,7 +265,7 @@ def get_coinmarketcap_standard_price(ticker):
 
         price_params = {"symbol": ticker, "convert": "USD"}
 
-        response = session.get(price_url, params=price_params)
+        response = session.get(price_url, headers=headers, params=price_params)
         data = response.json()
 
         # Log price response
@@ -402,7 +398,7 @@ def get_coinmarketcap_dex_historical_price(
         elif network_slug:
             parameters["network_slug"] = network_slug
 
-        response = requests.get(url, headers=headers, params=parameters)
+        response = session.get(url, headers=headers, params=parameters)
 
         if response.status_code == 200:
             data = response.json()
@@ -450,7 +446,7 @@ def get_coinmarketcap_standard_historical_price(ticker, timestamp):
         }
 
         platform_params = {"symbol": ticker}
-        platform_response = requests.get(
+        platform_response = session.get(
             platform_url, headers=headers, params=platform_params
         )
 
@@ -534,7 +530,7 @@ def get_coinmarketcap_standard_historical_price(ticker, timestamp):
 
         logger.debug(f"Historical price request parameters: {parameters}")
 
-        response = requests.get(quotes_url, headers=headers, params=parameters)
+        response = session.get(quotes_url, headers=headers, params=parameters)
 
         # Log response for debugging
         logger.info(
@@ -1,5 +1,10 @@
 import time
+import threading
+import orjson
 import requests
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional
 import logging
 from enum import Enum
@@ -15,24 +20,35 @@ class Network(Enum):
 
 logger = logging.getLogger(__name__)
 
+# Seconds a token's first page of holders is reused; holder counts drift slowly
+# and a burst of calls on one token would otherwise repeat the query
+HOLDERS_CACHE_TTL = 60
+
+# Tokens whose holders are cached before the least recently used are evicted
+HOLDERS_CACHE_SIZE = 1024
+
 
 class RateLimiter:
     def __init__(self, requests_per_second: int):
         self.requests_per_second = requests_per_second
         self.requests_timestamps = []
+        # Callers may share one limiter across worker threads
+        self.lock = threading.Lock()
 
     def wait_if_needed(self):
-        current_time = time.time()
-        self.requests_timestamps = [
-            ts for ts in self.requests_timestamps if current_time - ts < 1
-        ]
+        with self.lock:
+            current_time = time.time()
+            self.requests_timestamps = [
+                ts for ts in self.requests_timestamps if current_time - ts < 1
+            ]
 
-        if len(self.requests_timestamps) >= self.requests_per_second:
-            sleep_time = 1 - (current_time - self.requests_timestamps[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            if len(self.requests_timestamps) >= self.requests_per_second:
+                sleep_time = 1 - (current_time - self.requests_timestamps[0])
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                    current_time = time.time()
 
-        self.requests_timestamps.append(current_time)
+            self.requests_timestamps.append(current_time)
 
 
 class Codex:
@@ -42,6 +58,25 @@ class Codex:
     session.headers.update(
         {"Authorization": config.CODEX_API_KEY, "Content-Type": "application/json"}
     )
+    # Keep enough pooled keep-alive connections for the concurrent historical
+    # lookups, and retry rate-limited or transient failures with backoff
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("POST",),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        ),
+    )
+    # (contract, network) -> (expiry, holders), shared by lookup threads
+    holders_cache = OrderedDict()
+    holders_cache_lock = threading.Lock()
     SUPPORTED_NETWORKS = {
         # "ethereum": Network.ETHEREUM.value,
         # "arbitrum": Network.ARBITRUM.value,
@@ -87,11 +122,12 @@ class Codex:
             variables = {"address": contract_address, "networkId": network_id}
 
             response = Codex.session.post(
-                Codex.base_url, json={"query": query, "variables": variables}
+                Codex.base_url,
+                data=orjson.dumps({"query": query, "variables": variables}),
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if "errors" in data:
                     logger.error(f"GraphQL errors: {data['errors']}")
                     return None
@@ -138,11 +174,12 @@ class Codex:
             variables = {"tokenAddress": contract_address, "networkId": network_id}
 
             response = Codex.session.post(
-                Codex.base_url, json={"query": query, "variables": variables}
+                Codex.base_url,
+                data=orjson.dumps({"query": query, "variables": variables}),
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if "errors" in data:
                     logger.error(f"GraphQL errors: {data['errors']}")
                     return None
@@ -207,11 +244,12 @@ class Codex:
 
             Codex.rate_limiter.wait_if_needed()
             response = Codex.session.post(
-                Codex.base_url, json={"query": query, "variables": variables}
+                Codex.base_url,
+                data=orjson.dumps({"query": query, "variables": variables}),
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if "errors" in data:
                     logger.error(f"GraphQL errors: {data['errors']}")
                     return None
@@ -267,6 +305,12 @@ class Codex:
                 logger.error("No valid token inputs after network validation")
                 return None
 
+            # Map addresses back to their requested network in one pass
+            network_by_address = {
+                token["contract_address"].lower(): token["network"]
+                for token in token_inputs
+            }
+
             # Split inputs into batches of 25
             BATCH_SIZE = 25
             all_results = []
@@ -290,11 +334,12 @@ class Codex:
 
                 Codex.rate_limiter.wait_if_needed()
                 response = Codex.session.post(
-                    Codex.base_url, json={"query": query, "variables": variables}
+                    Codex.base_url,
+                    data=orjson.dumps({"query": query, "variables": variables}),
                 )
 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     if "errors" in data:
                         logger.error(f"GraphQL errors: {data['errors']}")
                         continue
@@ -306,12 +351,7 @@ class Codex:
                             "price": float(price.get("priceUsd", 0) or 0),
                             "confidence": price.get("confidence"),
                             "pool_address": price.get("poolAddress"),
-                            "network": next(
-                                t["network"]
-                                for t in token_inputs
-                                if t["contract_address"].lower()
-                                == price["address"].lower()
-                            ),
+                            "network": network_by_address[price["address"].lower()],
                             "contract_address": price["address"],
                         }
                         for price in prices
@@ -365,11 +405,12 @@ class Codex:
 
             Codex.rate_limiter.wait_if_needed()
             response = Codex.session.post(
-                Codex.base_url, json={"query": query, "variables": variables}
+                Codex.base_url,
+                data=orjson.dumps({"query": query, "variables": variables}),
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if "errors" in data:
                     logger.error(f"GraphQL errors: {data['errors']}")
                     return None
@@ -407,6 +448,38 @@ class Codex:
         network: str = "ethereum",
         cursor: str = None,
         sort: str = None,
+    ) -> Optional[Dict]:
+        """Get token holders, reusing a recent first page for the same token"""
+        if cursor or sort:
+            return Codex._fetch_token_holders(contract_address, network, cursor, sort)
+
+        # Addresses arrive checksummed from some sources and lowercase from others
+        key = (contract_address.lower(), network.lower())
+        now = time.monotonic()
+        with Codex.holders_cache_lock:
+            cached = Codex.holders_cache.get(key)
+            if cached is not None and cached[0] > now:
+                Codex.holders_cache.move_to_end(key)
+                return cached[1]
+
+        holders = Codex._fetch_token_holders(contract_address, network)
+        if holders is not None:
+            with Codex.holders_cache_lock:
+                Codex.holders_cache[key] = (
+                    time.monotonic() + HOLDERS_CACHE_TTL,
+                    holders,
+                )
+                Codex.holders_cache.move_to_end(key)
+                while len(Codex.holders_cache) > HOLDERS_CACHE_SIZE:
+                    Codex.holders_cache.popitem(last=False)
+        return holders
+
+    @staticmethod
+    def _fetch_token_holders(
+        contract_address: str,
+        network: str = "ethereum",
+        cursor: str = None,
+        sort: str = None,
     ) -> Optional[Dict]:
         """
         Get token holders using GraphQL
@@ -462,11 +535,12 @@ class Codex:
 
             Codex.rate_limiter.wait_if_needed()
             response = Codex.session.post(
-                Codex.base_url, json={"query": query, "variables": variables}
+                Codex.base_url,
+                data=orjson.dumps({"query": query, "variables": variables}),
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if "errors" in data:
                     logger.error(f"GraphQL errors: {data['errors']}")
                     return None
@@ -1,6 +1,69 @@
 import logging
+import orjson
 import requests
+import threading
+import time
 import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Seconds a ticker search result is reused, so a burst of tweets about the same
+# token costs one request. Misses are kept longer since an unlisted token rarely
+# shows up within seconds.
+TICKER_CACHE_TTL = 10
+TICKER_MISS_CACHE_TTL = 30
+
+# Ticker search results kept before the least recently used are evicted
+TICKER_CACHE_SIZE = 1024
+
+# Returned by a ticker search that failed, as opposed to one that found nothing;
+# failures are not cached so the next tweet retries the lookup
+_SEARCH_FAILED = object()
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Market data for the best DexScreener pair of a token, parsed once"""
+
+    current_price: float
+    volume_24h: float
+    liquidity: float
+    percent_change_24h: float
+    market_cap: float
+    fdv: float
+    dex: Optional[str]
+    network: Optional[str]
+    pair_name: str
+    last_updated: Optional[int]
+    pair_address: Optional[str]
+    contract_address: Optional[str]
+    token_name: Optional[str]
+    token_symbol: Optional[str]
+
+    @classmethod
+    def from_pair(cls, pair: dict) -> "MarketSnapshot":
+        """Build a snapshot from a raw DexScreener pair object"""
+        base_token = pair.get("baseToken", {})
+        return cls(
+            current_price=float(pair.get("priceUsd", 0) or 0),
+            volume_24h=float(pair.get("volume", {}).get("h24", 0) or 0),
+            liquidity=float(pair.get("liquidity", {}).get("usd", 0) or 0),
+            percent_change_24h=float(pair.get("priceChange", {}).get("h24", 0) or 0),
+            # Use the market cap provided by the API
+            market_cap=float(pair.get("marketCap", 0) or 0),
+            fdv=float(pair.get("fdv", 0) or 0),
+            dex=pair.get("dexId"),
+            network=pair.get("chainId"),
+            pair_name=f"{base_token.get('symbol')}/{pair.get('quoteToken', {}).get('symbol')}",
+            last_updated=pair.get("pairCreatedAt"),
+            pair_address=pair.get("pairAddress"),
+            contract_address=base_token.get("address"),
+            token_name=base_token.get("name"),
+            token_symbol=base_token.get("symbol"),
+        )
 
 
 class DexScreener:
@@ -11,7 +74,47 @@ class DexScreener:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
+        # Retry rate-limited and transient server errors with exponential
+        # backoff, honoring any Retry-After header sent by the API
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "POST"),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        # Room for the concurrent historical lookups to keep their connections
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=32, max_retries=retry))
+
+        # ticker -> (expiry, MarketSnapshot or None), shared by lookup threads
+        self.ticker_cache = OrderedDict()
+        self.ticker_cache_lock = threading.Lock()
+
     def get_token_by_ticker(self, ticker):
+        """Search DexScreener for a ticker, reusing recent results"""
+        key = ticker.upper()
+        now = time.monotonic()
+        with self.ticker_cache_lock:
+            cached = self.ticker_cache.get(key)
+            if cached is not None and cached[0] > now:
+                self.ticker_cache.move_to_end(key)
+                return cached[1]
+
+        snapshot = self._search_token_by_ticker(ticker)
+        if snapshot is _SEARCH_FAILED:
+            return None
+
+        ttl = TICKER_CACHE_TTL if snapshot is not None else TICKER_MISS_CACHE_TTL
+        with self.ticker_cache_lock:
+            self.ticker_cache[key] = (time.monotonic() + ttl, snapshot)
+            self.ticker_cache.move_to_end(key)
+            while len(self.ticker_cache) > TICKER_CACHE_SIZE:
+                self.ticker_cache.popitem(last=False)
+        return snapshot
+
+    def _search_token_by_ticker(self, ticker):
         """
         Get token market data from DexScreener API for most liquid pair with market cap check
 
@@ -19,20 +122,21 @@ class DexScreener:
             ticker (str): Token symbol/ticker to search for
 
         Returns:
-            dict: Market data including price, volume, liquidity etc. or None if error/no data
+            MarketSnapshot: Market data including price, volume, liquidity etc., None if
+            no pair matches, or _SEARCH_FAILED if the request failed
         """
         try:
             url = f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
-            response = requests.get(url)
+            response = self.session.get(url)
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 pairs = data.get("pairs", [])
 
-                self.logger.info(f"Number of pairs found: {len(pairs)}")
+                self.logger.info("Number of pairs found: %d", len(pairs))
 
                 if not pairs:
-                    self.logger.warning(f"No pairs found for {ticker} on DexScreener")
+                    self.logger.warning("No pairs found for %s on DexScreener", ticker)
                     return None
 
                 # Filter pairs to ensure base token symbol matches ticker
@@ -43,11 +147,11 @@ class DexScreener:
                     == ticker.upper()
                 ]
 
-                self.logger.info(f"Number of matching pairs: {len(matching_pairs)}")
+                self.logger.info("Number of matching pairs: %d", len(matching_pairs))
 
                 if not matching_pairs:
                     self.logger.warning(
-                        f"No pairs found with matching ticker {ticker} on DexScreener"
+                        "No pairs found with matching ticker %s on DexScreener", ticker
                     )
                     return None
 
@@ -64,40 +168,23 @@ class DexScreener:
                 # Get the most liquid pair
                 best_pair = sorted_pairs[0]
 
-                # Use the market cap provided by the API
-                market_cap = float(best_pair.get("marketCap", 0) or 0)
-                price_usd = float(best_pair.get("priceUsd", 0) or 0)
-
-                return {
-                    "current_price": price_usd,
-                    "volume_24h": float(best_pair.get("volume", {}).get("h24", 0) or 0),
-                    "liquidity": float(
-                        best_pair.get("liquidity", {}).get("usd", 0) or 0
-                    ),
-                    "percent_change_24h": float(
-                        best_pair.get("priceChange", {}).get("h24", 0) or 0
-                    ),
-                    "dex": best_pair.get("dexId"),
-                    "network": best_pair.get("chainId"),
-                    "pair_name": f"{best_pair.get('baseToken', {}).get('symbol')}/{best_pair.get('quoteToken', {}).get('symbol')}",
-                    "last_updated": best_pair.get("pairCreatedAt"),
-                    "pair_address": best_pair.get("pairAddress"),
-                    "contract_address": best_pair.get("baseToken", {}).get("address"),
-                    "market_cap": market_cap,
-                }
+                return MarketSnapshot.from_pair(best_pair)
 
             else:
                 self.logger.error(
-                    f"DexScreener API error ({response.status_code}): {response.text}"
+                    "DexScreener API error (%s): %s",
+                    response.status_code,
+                    response.text,
                 )
-                return None
+                return _SEARCH_FAILED
 
         except Exception as e:
             self.logger.error(
-                f"Error getting DexScreener market data for {ticker}: {str(e)}"
+                "Error getting DexScreener market data for %s: %s", ticker, e
             )
-            self.logger.error(f"Exception traceback: {traceback.format_exc()}")
-            return None
+            if self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error("Exception traceback: %s", traceback.format_exc())
+            return _SEARCH_FAILED
 
     def get_token_by_address(self, contract_address, chain_id):
         """
@@ -108,58 +195,44 @@ class DexScreener:
             contract_address (str): Token contract address
 
         Returns:
-            dict: Market data including price, volume, liquidity etc. or None if error/no data
+            MarketSnapshot: Market data including price, volume, liquidity etc. or None if error/no data
         """
         try:
             url = f"https://api.dexscreener.com/tokens/v1/{chain_id}/{contract_address}"
-            response = requests.get(url)
+            response = self.session.get(url)
 
             if response.status_code == 200:
-                pairs = response.json()  # API returns array with single pair object
+                # API returns array with single pair object
+                pairs = orjson.loads(response.content)
 
                 if not pairs or len(pairs) == 0:
                     self.logger.warning(
-                        f"No pairs found for contract {contract_address} on chain {chain_id}"
+                        "No pairs found for contract %s on chain %s",
+                        contract_address,
+                        chain_id,
                     )
                     return None
 
                 # Get the first (and usually only) pair
                 best_pair = pairs[0]
 
-                # Use the market cap provided by the API
-                market_cap = float(best_pair.get("marketCap", 0) or 0)
-                price_usd = float(best_pair.get("priceUsd", 0) or 0)
-
-                return {
-                    "current_price": price_usd,
-                    "volume_24h": float(best_pair.get("volume", {}).get("h24", 0) or 0),
-                    "liquidity": float(
-                        best_pair.get("liquidity", {}).get("usd", 0) or 0
-                    ),
-                    "percent_change_24h": float(
-                        best_pair.get("priceChange", {}).get("h24", 0) or 0
-                    ),
-                    "dex": best_pair.get("dexId"),
-                    "network": best_pair.get("chainId"),
-                    "pair_name": f"{best_pair.get('baseToken', {}).get('symbol')}/{best_pair.get('quoteToken', {}).get('symbol')}",
-                    "last_updated": best_pair.get("pairCreatedAt"),
-                    "pair_address": best_pair.get("pairAddress"),
-                    "contract_address": best_pair.get("baseToken", {}).get("address"),
-                    "market_cap": market_cap,
-                    "fdv": float(best_pair.get("fdv", 0) or 0),
-                    "token_name": best_pair.get("baseToken", {}).get("name"),
-                    "token_symbol": best_pair.get("baseToken", {}).get("symbol"),
-                }
+                return MarketSnapshot.from_pair(best_pair)
 
             else:
                 self.logger.error(
-                    f"DexScreener API error ({response.status_code}): {response.text}"
+                    "DexScreener API error (%s): %s",
+                    response.status_code,
+                    response.text,
                 )
                 return None
 
         except Exception as e:
             self.logger.error(
-                f"Error getting DexScreener data for {contract_address} on {chain_id}: {str(e)}"
+                "Error getting DexScreener data for %s on %s: %s",
+                contract_address,
+                chain_id,
+                e,
             )
-            self.logger.error(f"Exception traceback: {traceback.format_exc()}")
+            if self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error("Exception traceback: %s", traceback.format_exc())
             return None
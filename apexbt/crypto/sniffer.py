@@ -1,13 +1,30 @@
 import logging
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional
-from config.config import config
+from apexbt.config.config import config
 
 logger = logging.getLogger(__name__)
 
 
 class SolSnifferAPI:
     BASE_URL = "https://solsniffer.com/api/v2"
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "POST"),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+        ),
+    )
 
     def __init__(self):
         self.headers = {
@@ -36,9 +53,9 @@ class SolSnifferAPI:
             url = f"{self.BASE_URL}/token/{address}"
             logger.debug(f"Making request to: {url}")
 
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP error fetching token data from SolSniffer: {e}")
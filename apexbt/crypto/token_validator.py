@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 from apexbt.crypto.sniffer import SolSnifferAPI
+from apexbt.crypto.dexscreener import MarketSnapshot
 
 
 logger = logging.getLogger(__name__)
@@ -14,7 +16,7 @@ class TokenSource(Enum):
     VIRTUALS = "virtuals"
 
 
-@dataclass
+@dataclass(frozen=True)
 class ValidationCriteria:
     min_market_cap: float
     max_market_cap: float
@@ -23,6 +25,7 @@ class ValidationCriteria:
     source: TokenSource
 
     @classmethod
+    @lru_cache(maxsize=None)
     def twitter_default(cls) -> "ValidationCriteria":
         """Default criteria for Twitter-sourced tokens"""
         return cls(
@@ -34,6 +37,7 @@ class ValidationCriteria:
         )
 
     @classmethod
+    @lru_cache(maxsize=None)
     def pumpfun_default(cls) -> "ValidationCriteria":
         """Default criteria for PumpFun tokens (new Solana launches)"""
         return cls(
@@ -45,6 +49,7 @@ class ValidationCriteria:
         )
 
     @classmethod
+    @lru_cache(maxsize=None)
     def virtuals_default(cls) -> "ValidationCriteria":
         """Default criteria for Virtuals tokens"""
         return cls(
@@ -61,7 +66,7 @@ class TokenValidator:
         self.criteria = criteria or ValidationCriteria()
         self.sol_sniffer = SolSnifferAPI()
 
-    def validate_token(self, dex_data: dict) -> tuple[bool, str]:
+    def validate_token(self, dex_data: MarketSnapshot) -> tuple[bool, str]:
         """
         Validates a token based on market cap range, liquidity, and 24h volume
         Returns: (is_valid: bool, reason: str)
@@ -70,7 +75,7 @@ class TokenValidator:
             return False, "No token data available"
 
         # Check market cap range
-        market_cap = float(dex_data.get("market_cap", 0))
+        market_cap = dex_data.market_cap
         if market_cap < self.criteria.min_market_cap:
             return (
                 False,
@@ -83,7 +88,7 @@ class TokenValidator:
             )
 
         # Check liquidity
-        liquidity = float(dex_data.get("liquidity", 0))
+        liquidity = dex_data.liquidity
         if liquidity < self.criteria.min_liquidity:
             return (
                 False,
@@ -91,7 +96,7 @@ class TokenValidator:
             )
 
         # Check 24h volume
-        volume_24h = float(dex_data.get("volume_24h", 0))
+        volume_24h = dex_data.volume_24h
         if volume_24h < self.criteria.min_volume_24h:
             return (
                 False,
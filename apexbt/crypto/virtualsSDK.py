@@ -1,186 +1,230 @@
-import subprocess
-import json
 import os
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import asyncio
+import aiohttp
+import orjson
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Dict, Any, Iterable, List, Optional
+from datetime import datetime
+
+
+# Status filters used by the Virtuals API (mirrors FILTER_AGENT_STATUS in vp-trade-sdk)
+LISTING_STATUS = {"prototype": 1, "sentient": 2}
+
+# Primary sort order per listing type (mirrors fetchVirtualTokenLists in vp-trade-sdk)
+LISTING_SORT = {
+    "prototype": "virtualTokenValue:desc",
+    "sentient": "totalValueLocked:desc",
+}
+
+# Query params that never change between page fetches, built once per listing type
+LISTING_PARAMS = {
+    token_type: {
+        "filters[status]": str(status),
+        "sort[0]": LISTING_SORT[token_type],
+        "sort[1]": "createdAt:desc",
+        "populate[0]": "image",
+    }
+    for token_type, status in LISTING_STATUS.items()
+}
+
+# Fields read from every listing token built by VirtualsSDK._to_listing_token
+LISTING_TOKEN_FIELDS = itemgetter(
+    "id",
+    "name",
+    "symbol",
+    "tokenAddress",
+    "lpAddress",
+    "status",
+    "description",
+    "holderCount",
+    "mcapInVirtual",
+    "socials",
+    "image",
+)
+
+# Number of token ids remembered per listing type before the oldest are evicted
+MAX_PROCESSED_TOKENS = 50_000
 
 
 class VirtualsSDK:
     def __init__(self):
-        self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-
-        # Update SDK path to point to sdkClient.js
-        self.sdk_path = os.path.join(
-            self.project_root, "vp-trade-sdk", "dist", "vp-trade-sdk", "sdkClient.js"
-        )
-
-        print(f"Project root directory: {self.project_root}")
-        print(f"SDK path: {self.sdk_path}")
-
-        self._check_dependencies()
-        self.last_processed_tokens = {"sentient": set(), "prototype": set()}
+        self.api_url = (
+            os.getenv("VIRTUALS_API_URL") or "https://api.virtuals.io"
+        ).rstrip("/")
+        self.listing_url = f"{self.api_url}/api/virtuals"
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.last_processed_tokens = {
+            "sentient": OrderedDict(),
+            "prototype": OrderedDict(),
+        }
         self.last_check_time = {"sentient": None, "prototype": None}
 
-    def _check_dependencies(self) -> None:
-        """Check if Node.js and required packages are installed"""
-        try:
-            subprocess.run(["node", "--version"], capture_output=True, check=True)
-        except subprocess.CalledProcessError:
-            raise RuntimeError(
-                "Node.js is not installed. Please install Node.js first."
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={"accept": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=30),
             )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    @staticmethod
+    def _to_listing_token(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a raw Virtuals API item to the SDK token structure"""
+        socials = (item.get("socials") or {}).get("VERIFIED_LINKS") or {}
+        image = item.get("image") or {}
+        return {
+            "id": item.get("id") or 0,
+            "name": item.get("name") or "",
+            "status": item.get("status") or "",
+            "tokenAddress": item.get("tokenAddress") or item.get("preToken") or "",
+            "description": item.get("description") or "",
+            "lpAddress": item.get("lpAddress") or item.get("preTokenPair") or "",
+            "symbol": item.get("symbol") or "",
+            "holderCount": item.get("holderCount") or 0,
+            "mcapInVirtual": item.get("mcapInVirtual") or 0,
+            "socials": {
+                "VERIFIED_LINKS": {
+                    "TWITTER": socials.get("TWITTER") or "",
+                    "TELEGRAM": socials.get("TELEGRAM") or "",
+                }
+            },
+            "image": {"id": image.get("id") or 0, "url": image.get("url") or ""},
+        }
 
-        if not os.path.exists(self.sdk_path):
-            raise RuntimeError(
-                f"SDK not found at {self.sdk_path}. Please:\n"
-                f"1. cd {self.project_root}\n"
-                f"2. git clone https://github.com/Virtual-Protocol/vp-trade-sdk.git\n"
-                f"3. cd vp-trade-sdk\n"
-                f"4. npm install\n"
-                f"5. npm run build"
-            )
+    async def _fetch_listing(
+        self, token_type: str, page_number: int, page_size: int
+    ) -> Dict[str, Any]:
+        """Fetch one page of a Virtuals token listing from the REST API"""
+        params = {
+            **LISTING_PARAMS[token_type],
+            "pagination[page]": str(page_number),
+            "pagination[pageSize]": str(page_size),
+        }
 
-    def _execute_js(self, command: str) -> Dict[str, Any]:
-        """Execute JavaScript command and return parsed results"""
-        try:
-            # Execute Node.js command from the project root directory
-            result = subprocess.run(
-                ["node", "-e", command],
-                capture_output=True,
-                text=True,
-                check=True,
-                cwd=self.project_root,
-                env=os.environ,
-            )
+        async with self._get_session().get(self.listing_url, params=params) as response:
+            if response.status != 200:
+                raise Exception(
+                    f"Failed to fetch token lists. Status code: {response.status}"
+                )
+            data = orjson.loads(await response.read())
+
+        items = data.get("data") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise Exception("Unexpected token list response: missing data array")
 
-            # Try to find the JSON part of the output
-            output = result.stdout
-            try:
-                # Find the first occurrence of '{'
-                json_start = output.find("{")
-                if json_start >= 0:
-                    json_str = output[json_start:]
-                    return json.loads(json_str)
-                else:
-                    raise json.JSONDecodeError("No JSON found in output", output, 0)
-            except json.JSONDecodeError:
-                print("Full output:", output)  # Debug print
-                raise Exception("Failed to parse JSON from output")
-
-        except subprocess.CalledProcessError as e:
-            print("Error output:", e.stderr)
-            raise Exception(f"Error executing Node.js script: {e.stderr}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+        return {"tokens": [self._to_listing_token(item) for item in items]}
 
     def _format_token_data(
-        self, token: Dict[str, Any], token_type: str
+        self, token: Dict[str, Any], token_type: str, created_at: Optional[str] = None
     ) -> Dict[str, Any]:
         """Format token data into a standardized structure"""
+        (
+            token_id,
+            name,
+            symbol,
+            token_address,
+            lp_address,
+            status,
+            description,
+            holder_count,
+            market_cap,
+            socials,
+            image,
+        ) = LISTING_TOKEN_FIELDS(token)
         return {
-            "id": str(token.get("id")),
-            "name": token.get("name"),
-            "symbol": token.get("symbol"),
-            "token_address": token.get("tokenAddress"),
-            "lp_address": token.get("lpAddress"),
-            "status": token.get("status"),
-            "description": token.get("description"),
-            "holder_count": token.get("holderCount"),
-            "market_cap": token.get("mcapInVirtual"),
+            "id": str(token_id),
+            "name": name,
+            "symbol": symbol,
+            "token_address": token_address,
+            "lp_address": lp_address,
+            "status": status,
+            "description": description,
+            "holder_count": holder_count,
+            "market_cap": market_cap,
             "type": token_type,
-            "socials": token.get("socials", {}).get("VERIFIED_LINKS", []),
-            "image_url": token.get("image", {}).get("url"),
+            "socials": socials["VERIFIED_LINKS"],
+            "image_url": image["url"],
             "network": "ethereum",  # Default to ethereum for VP Trade
-            "created_at": datetime.now().isoformat(),  # Current timestamp if not provided
+            # Current timestamp if not provided
+            "created_at": created_at or datetime.now().isoformat(),
         }
 
     def _filter_new_tokens(self, tokens: list, token_type: str) -> list:
         """Filter out previously processed tokens and return only new ones"""
         current_time = datetime.now()
+        created_at = current_time.isoformat()
         new_tokens = []
-        current_token_ids = set()
+        processed = self.last_processed_tokens[token_type]
 
         for token in tokens:
-            token_id = str(token.get("id"))
+            # Virtuals ids are integers; key on them as-is rather than as strings
+            token_id = token.get("id")
 
-            # Skip if token has been processed before
-            if token_id in self.last_processed_tokens[token_type]:
+            # Skip if token has been processed before, without formatting it
+            if token_id in processed:
+                processed.move_to_end(token_id)
                 continue
 
             # Format token data
-            formatted_token = self._format_token_data(token, token_type)
+            formatted_token = self._format_token_data(token, token_type, created_at)
             new_tokens.append(formatted_token)
-            current_token_ids.add(token_id)
+            processed[token_id] = None
+
+        # Forget the least recently seen ids once the cap is reached
+        while len(processed) > MAX_PROCESSED_TOKENS:
+            processed.popitem(last=False)
 
-        # Update last processed tokens
-        self.last_processed_tokens[token_type].update(current_token_ids)
         self.last_check_time[token_type] = current_time
 
         return new_tokens
 
-    def get_sentient_listing(
+    async def get_sentient_listing(
         self, page_number: int = 1, page_size: int = 50
     ) -> Dict[str, Any]:
         """Get new sentient token listings"""
-        js_code = f"""
-            const {{ SDKClient }} = require("{self.sdk_path}");
-            require("dotenv").config();
-
-            const config = {{
-                privateKey: process.env.PRIVATE_KEY || "",
-                rpcUrl: process.env.RPC_PROVIDER_URL || "",
-                rpcApiKey: process.env.RPC_API_KEY || "",
-                virtualApiUrl: process.env.VIRTUALS_API_URL || "",
-                virtualApiUrlV2: process.env.VIRTUALS_API_URL_V2 || "",
-            }};
-
-            const sdkClient = new SDKClient(config);
-
-            (async () => {{
-                try {{
-                    const result = await sdkClient.getSentientListing({page_number}, {page_size});
-                    console.log(JSON.stringify(result));
-                }} catch (error) {{
-                    console.error(JSON.stringify({{ error: error.message }}));
-                    process.exit(1);
-                }}
-            }})();
-            """
-        result = self._execute_js(js_code)
+        result = await self._fetch_listing("sentient", page_number, page_size)
         if "tokens" in result:
             result["tokens"] = self._filter_new_tokens(result["tokens"], "sentient")
         return result
 
-    def get_prototype_listing(
+    async def get_prototype_listing(
         self, page_number: int = 1, page_size: int = 50
     ) -> Dict[str, Any]:
         """Get new prototype token listings"""
-        js_code = f"""
-        const {{ SDKClient }} = require("{self.sdk_path}");
-        require("dotenv").config();
-
-        const config = {{
-            privateKey: process.env.PRIVATE_KEY || "",
-            rpcUrl: process.env.RPC_PROVIDER_URL || "",
-            rpcApiKey: process.env.RPC_API_KEY || "",
-            virtualApiUrl: process.env.VIRTUALS_API_URL || "",
-            virtualApiUrlV2: process.env.VIRTUALS_API_URL_V2 || "",
-        }};
-
-        const sdkClient = new SDKClient(config);
-
-        (async () => {{
-            try {{
-                const result = await sdkClient.getPrototypeListing({page_number}, {page_size});
-                console.log(JSON.stringify(result));
-            }} catch (error) {{
-                console.error(JSON.stringify({{ error: error.message }}));
-                process.exit(1);
-            }}
-        }})();
-        """
-        result = self._execute_js(js_code)
+        result = await self._fetch_listing("prototype", page_number, page_size)
         if "tokens" in result:
             result["tokens"] = self._filter_new_tokens(result["tokens"], "prototype")
         return result
+
+    async def fetch_all_new(
+        self,
+        pages: int = 1,
+        page_size: int = 50,
+        token_types: Iterable[str] = ("sentient", "prototype"),
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch listing pages for each token type concurrently and return new tokens"""
+        fetches = [
+            (token_type, page)
+            for token_type in token_types
+            for page in range(1, pages + 1)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._fetch_listing(token_type, page, page_size)
+                for token_type, page in fetches
+            )
+        )
+
+        new_tokens = {token_type: [] for token_type in token_types}
+        for (token_type, _), result in zip(fetches, results):
+            new_tokens[token_type].extend(
+                self._filter_new_tokens(result["tokens"], token_type)
+            )
+        return new_tokens
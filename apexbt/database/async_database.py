@@ -0,0 +1,193 @@
+import asyncio
+import asyncpg
+import logging
+from datetime import datetime
+from typing import Optional
+
+from apexbt.database.database import (
+    INSERT_TWEET_SQL,
+    POOL_MAX_CONNECTIONS,
+    POOL_MIN_CONNECTIONS,
+    SESSION_SETTINGS,
+    Database,
+    numbered_placeholders,
+)
+
+logger = logging.getLogger(__name__)
+
+# asyncpg takes $n placeholders natively and prepares/caches statements itself
+ASYNC_INSERT_TWEET_SQL = numbered_placeholders(INSERT_TWEET_SQL)
+
+# Tweets waiting to be written; save_tweet blocks once this many are queued
+TWEET_QUEUE_SIZE = 1024
+
+# Most tweets written in one transaction by the flush task
+TWEET_FLUSH_SIZE = 64
+
+
+def _decode_timestamp(value: str) -> datetime:
+    """Parse a TIMESTAMP in the server's text output format"""
+    try:
+        # C parser; before Python 3.11 it only takes 3 or 6 fractional digits,
+        # while the server trims trailing zeros
+        return datetime.fromisoformat(value)
+    except ValueError:
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if "." in value else "%Y-%m-%d %H:%M:%S"
+        return datetime.strptime(value, fmt)
+
+
+async def _init_connection(conn):
+    """Match the sync driver's type handling on every new connection
+
+    NUMERIC decodes to float like DEC2FLOAT. TIMESTAMP goes over the wire as
+    text so ISO strings and tz-aware datetimes are accepted the way psycopg2
+    accepts them, instead of being rejected by the binary encoder.
+    """
+    await conn.set_type_codec(
+        "numeric", encoder=str, decoder=float, schema="pg_catalog", format="text"
+    )
+    await conn.set_type_codec(
+        "timestamp",
+        encoder=str,
+        decoder=_decode_timestamp,
+        schema="pg_catalog",
+        format="text",
+    )
+
+
+class AsyncDatabase:
+    """asyncpg-backed companion to Database for the async ingest loop
+
+    Only tweet writes go through it; they update the sync instance's tweet
+    caches so both stay coherent.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.pool: Optional[asyncpg.Pool] = None
+        self.tweet_queue: Optional[asyncio.Queue] = None
+        self.flush_task: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        """Create the connection pool and start the tweet flush task"""
+        if self.pool is None:
+            self.pool = await asyncpg.create_pool(
+                self.db.db_url,
+                min_size=POOL_MIN_CONNECTIONS,
+                max_size=POOL_MAX_CONNECTIONS,
+                init=_init_connection,
+                server_settings=SESSION_SETTINGS,
+            )
+        if self.flush_task is None:
+            self.tweet_queue = asyncio.Queue(maxsize=TWEET_QUEUE_SIZE)
+            self.flush_task = asyncio.create_task(self._flush_tweets())
+
+    async def close(self):
+        """Stop the flush task and close the connection pool"""
+        if self.flush_task is not None:
+            # The flush task writes everything queued ahead of the sentinel
+            # and resolves those futures before it exits
+            await self.tweet_queue.put(None)
+            try:
+                await self.flush_task
+            except Exception as e:
+                logger.error(f"Tweet flush task failed: {str(e)}")
+            self.flush_task = None
+            # Queued after shutdown began; fail them like a write error
+            while not self.tweet_queue.empty():
+                item = self.tweet_queue.get_nowait()
+                if item is not None and not item[2].done():
+                    item[2].set_result(False)
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def save_tweet(
+        self, tweet, ticker, ticker_status, price_data, ai_agent
+    ) -> bool:
+        """Save tweet to database, returning False if it was already stored
+
+        Queues the tweet for the flush task and waits for its transaction to
+        commit, so a trade referencing the tweet can be saved right after.
+        """
+        # Never queue into a consumer that has stopped or died
+        if self.flush_task is None or self.flush_task.done():
+            logger.error("Error saving tweet to database: flush task not running")
+            return False
+        try:
+            params = self.db._tweet_params(
+                tweet, ticker, ticker_status, price_data, ai_agent
+            )
+            saved = asyncio.get_running_loop().create_future()
+            await self.tweet_queue.put((params, ai_agent, saved))
+            return await saved
+        except Exception as e:
+            logger.error(f"Error saving tweet to database: {str(e)}")
+            return False
+
+    async def _flush_tweets(self):
+        """Write queued tweets, combining whatever piled up into one transaction
+
+        Returns once it takes the None sentinel queued by close.
+        """
+        while True:
+            batch = []
+            stopping = False
+            while not batch or (
+                len(batch) < TWEET_FLUSH_SIZE and not self.tweet_queue.empty()
+            ):
+                item = await self.tweet_queue.get()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                try:
+                    await self.save_tweets_batch(batch)
+                except Exception as e:
+                    # Keep flushing; the batch's futures were already resolved
+                    logger.error(f"Error flushing tweets to database: {str(e)}")
+            if stopping:
+                return
+
+    async def save_tweets_batch(self, batch):
+        """Insert (params, ai_agent, future) tweets in a single transaction
+
+        Each row gets its own savepoint so a bad tweet only drops itself. Each
+        future resolves to whether its tweet was newly inserted, or to False
+        if its insert or the whole transaction failed.
+        """
+        # None marks a row whose insert failed
+        results = [None] * len(batch)
+        try:
+            try:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        for i, (params, _, _) in enumerate(batch):
+                            try:
+                                async with conn.transaction():
+                                    tweet_id = await conn.fetchval(
+                                        ASYNC_INSERT_TWEET_SQL, *params
+                                    )
+                                results[i] = tweet_id is not None
+                            except Exception as e:
+                                logger.error(
+                                    f"Error saving tweet {params[0]} to database: {str(e)}"
+                                )
+            except Exception as e:
+                logger.error(f"Error saving tweets to database: {str(e)}")
+                results = [None] * len(batch)
+            else:
+                for (params, ai_agent, _), inserted in zip(batch, results):
+                    if inserted is None:
+                        continue
+                    try:
+                        self.db._record_saved_tweet(ai_agent, params[0], inserted)
+                    except Exception as e:
+                        # The row is committed; only the cache update failed
+                        logger.error(f"Error caching saved tweet {params[0]}: {str(e)}")
+        finally:
+            # Never leave a caller waiting, even if this batch was cancelled
+            for (_, _, saved), inserted in zip(batch, results):
+                if not saved.done():
+                    saved.set_result(bool(inserted))
@@ -1,39 +1,334 @@
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, Json, RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from apexbt.config.config import config
 from datetime import datetime
+import atexit
+import csv
+import io
 import logging
+import re
+import threading
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Session settings applied to every connection when it is opened. The three
+# monitors write concurrently, so a statement stuck behind another session's
+# row lock gives up instead of stalling its monitor, and a transaction left
+# open by a crashed caller cannot hold locks indefinitely.
+SESSION_SETTINGS = {
+    "lock_timeout": "5s",
+    "idle_in_transaction_session_timeout": "60s",
+}
+
+# Historical backfills are replayable, so they trade commit durability for write
+# throughput: a crash can lose the last few commits but never corrupts data.
+HISTORICAL_SESSION_SETTINGS = {**SESSION_SETTINGS, "synchronous_commit": "off"}
+
+POOL_MIN_CONNECTIONS = 2
+POOL_MAX_CONNECTIONS = 16
+
+# Rows fetched per round trip by the server-side cursors in the trade loaders
+LOADER_ITERSIZE = 2000
+
+# Tables and indexes created by Database.init_database
+SCHEMA_RELATIONS = (
+    "tweets",
+    "trades",
+    "pnl",
+    "price_cache",
+    "idx_pnl_position",
+    "idx_tweets_agent_created_id",
+    "idx_trades_open",
+    "idx_trades_status_exit",
+    "trade_stats",
+    "idx_trade_stats_id",
+)
+
+SCHEMA_READY_SQL = """
+    SELECT bool_and(to_regclass(name) IS NOT NULL)
+        AND (
+            to_regclass('user_trades') IS NULL
+            OR (
+                to_regclass('idx_user_trades_open_sl') IS NOT NULL
+                AND to_regclass('idx_user_trades_open_tp') IS NOT NULL
+            )
+        )
+    FROM unnest(%s::text[]) AS name
+"""
+
+TRADE_STATS_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS trade_stats AS
+    SELECT
+        1 as id,
+        COUNT(*) as total_trades,
+        SUM(CASE WHEN status = 'Closed' THEN 1 ELSE 0 END) as closed_trades,
+        SUM(CASE WHEN exit_reason = 'Stop Loss' THEN 1 ELSE 0 END) as stopped_trades,
+        AVG(CASE WHEN exit_reason = 'Stop Loss' THEN pnl_percentage ELSE NULL END) as avg_stop_loss_pnl,
+        AVG(CASE WHEN status = 'Closed' THEN pnl_percentage ELSE NULL END) as avg_closed_trade_pnl,
+        MIN(pnl_percentage) as worst_trade,
+        MAX(pnl_percentage) as best_trade,
+        AVG(max_drawdown) as avg_max_drawdown,
+        AVG(max_profit) as avg_max_profit
+    FROM trades
+"""
+
+TRADE_STATS_SQL = """
+    SELECT
+        total_trades, closed_trades, stopped_trades, avg_stop_loss_pnl,
+        avg_closed_trade_pnl, worst_trade, best_trade, avg_max_drawdown,
+        avg_max_profit
+    FROM trade_stats
+"""
+
+INSERT_TWEET_SQL = """
+    INSERT INTO tweets (
+        tweet_id, ai_agent, text, created_at, timestamp, ticker,
+        ticker_status, current_price, tweet_time_price, volume_24h,
+        liquidity, price_change_24h, dex, network, trading_pair,
+        contract_address, last_updated
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (tweet_id) DO NOTHING
+    RETURNING tweet_id
+"""
+
+PROCESSED_TWEETS_SQL = "SELECT ai_agent, tweet_id FROM tweets"
+
+LATEST_TWEET_ID_SQL = """
+    SELECT tweet_id FROM tweets
+    WHERE ai_agent = %s
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+CACHED_PRICE_SQL = """
+    SELECT payload FROM price_cache
+    WHERE contract_address = %s AND network = %s AND bucket = %s
+"""
+
+SAVE_CACHED_PRICE_SQL = """
+    INSERT INTO price_cache (contract_address, network, bucket, payload)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT DO NOTHING
+"""
+
+INSERT_TRADE_SQL = """
+    INSERT INTO trades (
+        trade_id, ai_agent, timestamp, ticker, contract_address,
+        entry_price, position_size, direction, tweet_id,
+        status, notes, network, market_cap
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING trade_id, timestamp, entry_price, position_size, status
+"""
+
+UPDATE_TRADE_EXIT_SQL = """
+    UPDATE trades
+    SET status = 'Closed',
+        exit_price = %s,
+        exit_timestamp = %s,
+        exit_reason = %s,
+        pnl_amount = %s,
+        pnl_percentage = %s,
+        trade_duration = %s,
+        notes = %s,
+        max_drawdown = %s,
+        max_profit = %s
+    WHERE trade_id = %s
+    AND status = 'Open'
+    RETURNING trade_id, pnl_amount, pnl_percentage, trade_duration
+"""
+
+# Joins every changed trade against one VALUES list, filled in by execute_values
+UPDATE_TRADE_ATH_SQL = """
+    UPDATE trades
+    SET ath_price = v.ath_price,
+        ath_timestamp = v.ath_timestamp,
+        stop_loss = v.stop_loss
+    FROM (VALUES %s) AS v (trade_id, ath_price, ath_timestamp, stop_loss)
+    WHERE trades.trade_id = v.trade_id
+    AND trades.status = 'Open'
+"""
+
+UPDATE_TRADE_ATH_TEMPLATE = "(%s, %s::numeric, %s::timestamp, %s::numeric)"
+
+# Rows packed into each multi-row statement by execute_values
+WRITE_BATCH_SIZE = 200
+
+
+def _none_get(key):
+    """Stand-in for dict.get when a tweet has no price data"""
+    return None
+
+
+def session_options(settings: dict) -> str:
+    """Render session settings as a libpq options string"""
+    return " ".join(f"-c {name}={value}" for name, value in settings.items())
+
+
+def numbered_placeholders(sql: str) -> str:
+    """Rewrite psycopg2 %s placeholders as the server-side $1, $2, ... form"""
+    numbers = iter(range(1, sql.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(numbers)}", sql)
+
+
+# Read NUMERIC/DECIMAL columns straight into floats; prices and stats are only
+# ever used in float arithmetic
+DEC2FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "DEC2FLOAT",
+    lambda value, cursor: float(value) if value is not None else None,
+)
+
+
+class PreparedStatementConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements were prepared on its session"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        psycopg2.extensions.register_type(DEC2FLOAT, self)
+
 
 class Database:
+    # Connection pools shared by every Database instance, keyed by DSN and options
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    __slots__ = (
+        "db_url",
+        "connect_kwargs",
+        "_pool_key",
+        "_processed_tweets",
+        "_processed_tweets_lock",
+        "_latest_by_agent",
+        "_trade_generation",
+        "_stats_cache",
+    )
+
     def __init__(self, historical=False):
-        self.historical = historical
         self.db_url = config.DATABASE_URL
         if not self.db_url:
             raise ValueError("Database URL not configured")
+        self.connect_kwargs = {
+            "options": session_options(
+                HISTORICAL_SESSION_SETTINGS if historical else SESSION_SETTINGS
+            )
+        }
+        self._pool_key = (self.db_url, tuple(sorted(self.connect_kwargs.items())))
+        # (ai_agent, tweet_id) pairs already stored, loaded on first lookup
+        self._processed_tweets = None
+        self._processed_tweets_lock = threading.Lock()
+        # Latest stored tweet id per agent, filled on lookup and kept by save_tweet
+        self._latest_by_agent = {}
+        # Bumped on every trade write; cached aggregates from older generations
+        # are recomputed
+        self._trade_generation = 0
+        self._stats_cache = {}
+        atexit.register(self.close)
+
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Return the shared connection pool, creating it on first use"""
+        pool = self._pools.get(self._pool_key)
+        if pool is None or pool.closed:
+            with self._pools_lock:
+                pool = self._pools.get(self._pool_key)
+                if pool is None or pool.closed:
+                    pool = ThreadedConnectionPool(
+                        POOL_MIN_CONNECTIONS,
+                        POOL_MAX_CONNECTIONS,
+                        self.db_url,
+                        connection_factory=PreparedStatementConnection,
+                        **self.connect_kwargs,
+                    )
+                    self._pools[self._pool_key] = pool
+        return pool
 
     @contextmanager
-    def get_connection(self):
-        """Get database connection with context manager"""
+    def get_connection(self, autocommit=False):
+        """Check out a pooled database connection with context manager
+
+        Single-statement callers pass autocommit=True to skip the implicit
+        BEGIN/COMMIT round trips; multi-statement work keeps a transaction.
+        """
+        pool = self._get_pool()
         conn = None
         try:
-            conn = psycopg2.connect(self.db_url)
+            conn = pool.getconn()
+            conn.autocommit = autocommit
             yield conn
         except psycopg2.Error as e:
             logger.error(f"Database connection error: {str(e)}")
             raise
         finally:
-            if conn:
-                conn.close()
+            # putconn rolls back any open transaction and drops broken connections
+            if conn is not None:
+                pool.putconn(conn)
+
+    @contextmanager
+    def _with_conn(self, conn=None, autocommit=False):
+        """Yield the caller's connection if given, otherwise check one out"""
+        if conn is not None:
+            yield conn
+            return
+        with self.get_connection(autocommit=autocommit) as conn:
+            yield conn
+
+    @contextmanager
+    def batch(self):
+        """Run several writes on one connection inside a single transaction
+
+        Commits once on exit, or rolls back if any statement failed. Callbacks
+        registered with after_commit run only once the commit succeeded and
+        the connection is back in the pool.
+        """
+        with self.get_connection() as conn:
+            batch = DatabaseBatch(self, conn)
+            try:
+                yield batch
+            except Exception:
+                conn.rollback()
+                self._invalidate_write_caches()
+                raise
+            batch.commit()
+        batch.run_after_commit()
+
+    def _invalidate_write_caches(self):
+        """Drop caches that may hold writes from a rolled back batch"""
+        with self._processed_tweets_lock:
+            self._processed_tweets = None
+        self.invalidate_latest_tweet_ids()
+        self._trade_generation += 1
+
+    @staticmethod
+    def _execute_prepared(cursor, name, sql, params):
+        """Run sql as a named prepared statement, preparing it once per connection"""
+        conn = cursor.connection
+        if name not in conn.prepared:
+            statement = numbered_placeholders(sql)
+            cursor.execute(f"PREPARE {name} AS {statement}")
+            conn.prepared.add(name)
+        placeholders = ", ".join(["%s"] * len(params))
+        cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+
+    def close(self):
+        """Close the connection pool used by this instance"""
+        with self._pools_lock:
+            pool = self._pools.pop(self._pool_key, None)
+        if pool is not None and not pool.closed:
+            pool.closeall()
 
     def init_database(self):
         """Initialize the database with required tables"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # Warm start: everything already exists, so skip the DDL entirely
+            cursor.execute(SCHEMA_READY_SQL, (list(SCHEMA_RELATIONS),))
+            if cursor.fetchone()[0]:
+                return
+
+            # All tables in a single round trip
             cursor.execute(
                 """
                 CREATE TABLE IF NOT EXISTS tweets (
@@ -54,12 +349,8 @@ class Database:
                     trading_pair TEXT,
                     contract_address TEXT,
                     last_updated TIMESTAMP
-                )
-            """
-            )
+                );
 
-            cursor.execute(
-                """
                 CREATE TABLE IF NOT EXISTS trades (
                     trade_id TEXT PRIMARY KEY,
                     ai_agent TEXT,
@@ -87,12 +378,8 @@ class Database:
                     max_profit DECIMAL,
                     market_cap DECIMAL,
                     FOREIGN KEY(tweet_id) REFERENCES tweets(tweet_id)
-                )
-            """
-            )
+                );
 
-            cursor.execute(
-                """
                 CREATE TABLE IF NOT EXISTS pnl (
                     id SERIAL PRIMARY KEY,
                     ai_agent TEXT,
@@ -105,114 +392,257 @@ class Database:
                     current_value DECIMAL,
                     pnl DECIMAL,
                     contract_address TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS price_cache (
+                    contract_address TEXT,
+                    network TEXT,
+                    bucket BIGINT,
+                    payload JSONB NOT NULL,
+                    PRIMARY KEY (contract_address, network, bucket)
+                )
+            """
+            )
+
+            # PNL rows are upserted per position; the table is derived data, so
+            # clear it before adding the unique key to drop any duplicates
+            cursor.execute("SELECT to_regclass('idx_pnl_position') IS NULL")
+            if cursor.fetchone()[0]:
+                cursor.execute("TRUNCATE TABLE pnl RESTART IDENTITY")
+                cursor.execute(
+                    """
+                    CREATE UNIQUE INDEX idx_pnl_position
+                    ON pnl (ai_agent, ticker, contract_address, entry_time)
+                """
                 )
+
+            # Indexes for the per-agent tweet lookups and open-trade scans.
+            # Carrying tweet_id lets the latest-tweet and processed-tweet
+            # queries run as index-only scans, never touching tweet text.
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_tweets_agent_created_id
+                ON tweets (ai_agent, created_at DESC) INCLUDE (tweet_id);
+                DROP INDEX IF EXISTS idx_tweets_agent_created
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_trades_open
+                ON trades (ticker, contract_address)
+                WHERE status = 'Open'
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_trades_status_exit
+                ON trades (status, exit_timestamp DESC)
             """
             )
 
+            # Single-row trade aggregates, refreshed whenever a trade is written;
+            # the unique index lets the refresh run CONCURRENTLY
+            cursor.execute(TRADE_STATS_VIEW_SQL)
+            cursor.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_trade_stats_id
+                ON trade_stats (id)
+            """
+            )
+
+            # user_trades is not created here; index it only if it exists
+            cursor.execute("SELECT to_regclass('user_trades') IS NOT NULL")
+            if cursor.fetchone()[0]:
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_user_trades_open_sl
+                    ON user_trades (status)
+                    WHERE status = 'open' AND stop_loss_price IS NOT NULL
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_user_trades_open_tp
+                    ON user_trades (status)
+                    WHERE status = 'open' AND take_profit_price IS NOT NULL
+                """
+                )
+
             conn.commit()
 
-    def save_tweet(self, tweet, ticker, ticker_status, price_data, ai_agent):
-        """Save tweet to database"""
+    @staticmethod
+    def _tweet_params(tweet, ticker, ticker_status, price_data, ai_agent):
+        """Build the INSERT_TWEET_SQL parameters for a tweet"""
+        get = price_data.get if price_data else _none_get
+        return (
+            str(tweet.id),
+            ai_agent,
+            tweet.text,
+            tweet.created_at,
+            datetime.now(),
+            ticker if ticker else "N/A",
+            ticker_status,
+            get("current_price"),
+            get("tweet_time_price"),
+            get("volume_24h"),
+            get("liquidity"),
+            get("percent_change_24h"),
+            get("dex"),
+            get("network"),
+            get("pair_name"),
+            get("contract_address"),
+            get("last_updated"),
+        )
+
+    def _record_saved_tweet(self, ai_agent: str, tweet_id: str, inserted: bool):
+        """Update the tweet caches after an insert attempt"""
+        if self._processed_tweets is not None:
+            self._processed_tweets.add((ai_agent, tweet_id))
+        if inserted:
+            self._remember_latest_tweet_id(ai_agent, tweet_id)
+            logger.info(f"Tweet saved to database: {tweet_id}")
+        else:
+            logger.info(f"Tweet already in database: {tweet_id}")
+
+    def save_tweet(
+        self, tweet, ticker, ticker_status, price_data, ai_agent, conn=None
+    ) -> bool:
+        """Save tweet to database, returning False if it was already stored"""
         try:
-            with self.get_connection() as conn:
+            with self._with_conn(conn, autocommit=True) as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO tweets (
-                        tweet_id, ai_agent, text, created_at, timestamp, ticker,
-                        ticker_status, current_price, tweet_time_price, volume_24h,
-                        liquidity, price_change_24h, dex, network, trading_pair,
-                        contract_address, last_updated
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        str(tweet.id),
-                        ai_agent,
-                        tweet.text,
-                        tweet.created_at,
-                        datetime.now(),
-                        ticker if ticker else "N/A",
-                        ticker_status,
-                        price_data.get("current_price") if price_data else None,
-                        price_data.get("tweet_time_price") if price_data else None,
-                        price_data.get("volume_24h") if price_data else None,
-                        price_data.get("liquidity") if price_data else None,
-                        price_data.get("percent_change_24h") if price_data else None,
-                        price_data.get("dex") if price_data else None,
-                        price_data.get("network") if price_data else None,
-                        price_data.get("pair_name") if price_data else None,
-                        price_data.get("contract_address") if price_data else None,
-                        price_data.get("last_updated") if price_data else None,
-                    ),
+                params = self._tweet_params(
+                    tweet, ticker, ticker_status, price_data, ai_agent
                 )
-                conn.commit()
-                logger.info(f"Tweet saved to database: {tweet.id}")
+                self._execute_prepared(cursor, "insert_tweet", INSERT_TWEET_SQL, params)
+                inserted = cursor.fetchone() is not None
+                # params[0] is the tweet id, already converted to str
+                self._record_saved_tweet(ai_agent, params[0], inserted)
+                return inserted
         except Exception as e:
             logger.error(f"Error saving tweet to database: {str(e)}")
+            return False
+
+    def _load_processed_tweets(self) -> set:
+        """Load every stored (ai_agent, tweet_id) pair into the in-memory cache"""
+        with self._processed_tweets_lock:
+            if self._processed_tweets is None:
+                with self.get_connection(autocommit=True) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(PROCESSED_TWEETS_SQL)
+                    self._processed_tweets = set(cursor)
+        return self._processed_tweets
 
     def is_tweet_processed(self, tweet_id: str, ai_agent: str) -> bool:
         """Check if a tweet has already been processed"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT 1 FROM tweets WHERE tweet_id = %s AND ai_agent = %s",
-                (str(tweet_id), ai_agent),
-            )
-            return cursor.fetchone() is not None
+        processed = self._processed_tweets
+        if processed is None:
+            processed = self._load_processed_tweets()
+        return (ai_agent, str(tweet_id)) in processed
+
+    def _remember_latest_tweet_id(self, ai_agent: str, tweet_id: str):
+        """Record a newly saved tweet id if it is newer than the cached one"""
+        if ai_agent not in self._latest_by_agent:
+            return
+        latest = self._latest_by_agent[ai_agent]
+        # Tweet ids are snowflakes, so a larger id is a newer tweet
+        if latest is None or int(tweet_id) > int(latest):
+            self._latest_by_agent[ai_agent] = tweet_id
+
+    def invalidate_latest_tweet_ids(self):
+        """Forget cached latest tweet ids so the next lookup hits the database"""
+        self._latest_by_agent.clear()
 
     def get_latest_tweet_id_by_agent(self, ai_agent: str) -> str:
         """Get the latest tweet ID for an AI agent"""
-        with self.get_connection() as conn:
+        if ai_agent in self._latest_by_agent:
+            return self._latest_by_agent[ai_agent]
+
+        with self.get_connection(autocommit=True) as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT tweet_id FROM tweets WHERE ai_agent = %s ORDER BY created_at DESC LIMIT 1",
-                (ai_agent,),
+            self._execute_prepared(
+                cursor, "latest_tweet_id", LATEST_TWEET_ID_SQL, (ai_agent,)
             )
             result = cursor.fetchone()
-            return result[0] if result else None
+            latest = result[0] if result else None
+        self._latest_by_agent[ai_agent] = latest
+        return latest
+
+    def get_cached_price(self, contract_address: str, network: str, bucket: int):
+        """Return the stored historical price for a minute bucket, if any"""
+        try:
+            with self.get_connection(autocommit=True) as conn:
+                cursor = conn.cursor()
+                self._execute_prepared(
+                    cursor,
+                    "cached_price",
+                    CACHED_PRICE_SQL,
+                    (contract_address, network, bucket),
+                )
+                result = cursor.fetchone()
+                return result[0] if result else None
+        except Exception as e:
+            logger.error(f"Error reading cached price: {str(e)}")
+            return None
+
+    def save_cached_price(
+        self, contract_address: str, network: str, bucket: int, payload: dict
+    ):
+        """Store a historical price for a minute bucket"""
+        try:
+            with self.get_connection(autocommit=True) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    SAVE_CACHED_PRICE_SQL,
+                    (contract_address, network, bucket, Json(payload)),
+                )
+        except Exception as e:
+            logger.error(f"Error saving cached price: {str(e)}")
+
+    @staticmethod
+    def _row_to_active_trade(row):
+        """Map an open trades row to TradePosition keyword arguments"""
+        (
+            trade_id,
+            ticker,
+            entry_price,
+            timestamp,
+            ai_agent,
+            contract_address,
+            network,
+            market_cap,
+        ) = row
+        return {
+            "ticker": ticker,
+            "entry_price": entry_price,
+            # TIMESTAMP columns already come back as datetime
+            "entry_timestamp": timestamp,
+            "ai_agent": ai_agent,
+            "contract_address": contract_address,
+            "network": network,
+            "market_cap": market_cap,
+            "status": "Open",
+            "trade_id": trade_id,
+        }
 
     def load_active_trades(self):
         """Load active trades from database"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor(cursor_factory=DictCursor)
+                # Server-side cursor so rows stream in itersize batches
+                cursor = conn.cursor(name="load_active_trades")
+                cursor.itersize = LOADER_ITERSIZE
                 cursor.execute(
                     """
-                    SELECT ticker, entry_price, timestamp, ai_agent,
+                    SELECT trade_id, ticker, entry_price, timestamp, ai_agent,
                            contract_address, network, market_cap
                     FROM trades
                     WHERE status = 'Open'
                 """
                 )
-                trades = cursor.fetchall()
-
-                active_trades = []
-                for trade in trades:
-                    try:
-                        entry_timestamp = datetime.strptime(
-                            trade["timestamp"].strftime("%Y-%m-%d %H:%M:%S.%f"),
-                            "%Y-%m-%d %H:%M:%S.%f",
-                        )
-                    except ValueError:
-                        entry_timestamp = datetime.strptime(
-                            trade["timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
-                            "%Y-%m-%d %H:%M:%S",
-                        )
-
-                    active_trades.append(
-                        {
-                            "ticker": trade["ticker"],
-                            "entry_price": float(trade["entry_price"]),
-                            "entry_timestamp": entry_timestamp,
-                            "ai_agent": trade["ai_agent"],
-                            "contract_address": trade["contract_address"],
-                            "network": trade["network"],
-                            "market_cap": trade["market_cap"],
-                            "status": "Open",
-                        }
-                    )
-
-                return active_trades
+                # Map rows straight off the cursor instead of copying them
+                # into an intermediate fetchall() list first
+                return [self._row_to_active_trade(trade) for trade in cursor]
 
         except Exception as e:
             logger.error(f"Error loading active trades: {str(e)}")
@@ -224,34 +654,97 @@ class Database:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
 
-                # Clear existing PNL data
-                cursor.execute("DELETE FROM pnl")
-
-                # Insert new PNL data
-                for stat in stats:
-                    if stat["type"] == "trade":
-                        cursor.execute(
-                            """
-                            INSERT INTO pnl (
-                                ai_agent, ticker, entry_time, entry_price,
-                                current_price, price_change_percentage,
-                                invested_amount, current_value, pnl,
-                                contract_address
-                            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                            """,
-                            (
-                                stat["ai_agent"],
-                                stat["ticker"],
-                                stat["entry_time"],
-                                stat["entry_price"],
-                                stat["current_price"],
-                                float(stat["price_change"].rstrip("%")),
-                                stat["invested_amount"],
-                                stat["current_value"],
-                                stat["pnl_dollars"],
-                                stat.get("contract_address", None),
-                            ),
-                        )
+                rows = [
+                    (
+                        stat["ai_agent"],
+                        stat["ticker"],
+                        stat["entry_time"],
+                        stat["entry_price"],
+                        stat["current_price"],
+                        stat["price_change_pct"],
+                        stat["invested_amount"],
+                        stat["current_value"],
+                        stat["pnl_dollars"],
+                        stat.get("contract_address", None),
+                    )
+                    for stat in stats
+                    if stat["type"] == "trade"
+                ]
+                # A single upsert cannot touch the same row twice, so keep one row
+                # per (ai_agent, ticker, contract_address, entry_time)
+                rows = list({(r[0], r[1], r[9], r[2]): r for r in rows}.values())
+
+                # Stream the snapshot into a staging table with COPY
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.execute(
+                    """
+                    CREATE TEMP TABLE pnl_staging (
+                        ai_agent TEXT,
+                        ticker TEXT,
+                        entry_time TIMESTAMP,
+                        entry_price DECIMAL,
+                        current_price DECIMAL,
+                        price_change_percentage DECIMAL,
+                        invested_amount DECIMAL,
+                        current_value DECIMAL,
+                        pnl DECIMAL,
+                        contract_address TEXT
+                    ) ON COMMIT DROP
+                    """
+                )
+                cursor.copy_expert(
+                    """
+                    COPY pnl_staging (
+                        ai_agent, ticker, entry_time, entry_price,
+                        current_price, price_change_percentage,
+                        invested_amount, current_value, pnl,
+                        contract_address
+                    ) FROM STDIN WITH (FORMAT CSV)
+                    """,
+                    buffer,
+                )
+
+                # Drop positions that are no longer reported and upsert the
+                # current ones (only rewriting rows whose values moved), sent
+                # together in one round trip
+                cursor.execute(
+                    """
+                    DELETE FROM pnl
+                    WHERE NOT EXISTS (
+                        SELECT 1
+                        FROM pnl_staging s
+                        WHERE s.ai_agent = pnl.ai_agent
+                        AND s.ticker = pnl.ticker
+                        AND s.entry_time = pnl.entry_time
+                        AND s.contract_address = pnl.contract_address
+                    );
+
+                    INSERT INTO pnl (
+                        ai_agent, ticker, entry_time, entry_price,
+                        current_price, price_change_percentage,
+                        invested_amount, current_value, pnl,
+                        contract_address
+                    )
+                    SELECT
+                        ai_agent, ticker, entry_time, entry_price,
+                        current_price, price_change_percentage,
+                        invested_amount, current_value, pnl,
+                        contract_address
+                    FROM pnl_staging
+                    ON CONFLICT (ai_agent, ticker, contract_address, entry_time)
+                    DO UPDATE SET
+                        entry_price = EXCLUDED.entry_price,
+                        current_price = EXCLUDED.current_price,
+                        price_change_percentage = EXCLUDED.price_change_percentage,
+                        invested_amount = EXCLUDED.invested_amount,
+                        current_value = EXCLUDED.current_value,
+                        pnl = EXCLUDED.pnl
+                    WHERE pnl.current_price IS DISTINCT FROM EXCLUDED.current_price
+                    OR pnl.entry_price IS DISTINCT FROM EXCLUDED.entry_price
+                    """
+                )
 
                 conn.commit()
 
@@ -259,188 +752,185 @@ class Database:
             logger.error(f"Error updating PNL table: {str(e)}")
             raise
 
-    def save_trade(self, trade_data):
-        """Save trade information to the database"""
+    @staticmethod
+    def _trade_params(trade_data):
+        """Build the INSERT_TRADE_SQL parameters for a trade"""
+        return (
+            trade_data["trade_id"],
+            trade_data["ai_agent"],
+            trade_data["timestamp"].replace(microsecond=0),
+            trade_data["ticker"],
+            trade_data["contract_address"],
+            trade_data["entry_price"],
+            trade_data["position_size"],
+            trade_data["direction"],
+            trade_data["tweet_id"],
+            trade_data["status"],
+            trade_data["notes"],
+            trade_data["network"],
+            trade_data["market_cap"],
+        )
+
+    @staticmethod
+    def _trade_exit_params(trade_data):
+        """Build the UPDATE_TRADE_EXIT_SQL parameters for a closed trade"""
+        return (
+            trade_data["exit_price"],
+            trade_data["exit_timestamp"],
+            trade_data["exit_reason"],
+            trade_data["pnl_amount"],
+            trade_data["pnl_percentage"],
+            trade_data["trade_duration"],
+            trade_data["notes"],
+            trade_data["max_drawdown"],
+            trade_data["max_profit"],
+            trade_data["trade_id"],
+        )
+
+    def save_trade(self, trade_data, conn=None):
+        """Save trade information to the database and return the stored row"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            with self._with_conn(conn, autocommit=True) as conn:
+                cursor = conn.cursor(cursor_factory=DictCursor)
                 cursor.execute(
-                    """
-                    INSERT INTO trades (
-                        trade_id, ai_agent, timestamp, ticker, contract_address,
-                        entry_price, position_size, direction, tweet_id,
-                        status, notes, network, market_cap
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        trade_data["trade_id"],
-                        trade_data["ai_agent"],
-                        trade_data["timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
-                        trade_data["ticker"],
-                        trade_data["contract_address"],
-                        trade_data["entry_price"],
-                        trade_data["position_size"],
-                        trade_data["direction"],
-                        trade_data["tweet_id"],
-                        trade_data["status"],
-                        trade_data["notes"],
-                        trade_data["network"],
-                        trade_data["market_cap"],
-                    ),
+                    INSERT_TRADE_SQL,
+                    self._trade_params(trade_data),
                 )
-                conn.commit()
-                return True
+                saved_trade = cursor.fetchone()
+                self._trade_generation += 1
+                return saved_trade
         except Exception as e:
             logger.error(f"Error saving trade to database: {str(e)}")
-            return False
+            return None
 
-    def update_trade_exit(self, trade_data):
-        """Update trade record with exit information"""
+    def update_trade_exit(self, trade_data, conn=None):
+        """Update trade record with exit information and return the closed row"""
+        batched = conn is not None
+        try:
+            with self._with_conn(conn, autocommit=True) as conn:
+                cursor = conn.cursor(cursor_factory=DictCursor)
+                cursor.execute(
+                    UPDATE_TRADE_EXIT_SQL,
+                    self._trade_exit_params(trade_data),
+                )
+                closed_trade = cursor.fetchone()
+                # Batches refresh the stats view once when they commit
+                if closed_trade is not None and not batched:
+                    self._refresh_trade_stats(cursor)
+                self._trade_generation += 1
+                return closed_trade
+        except Exception as e:
+            logger.error(f"Error in update_trade_exit: {str(e)}")
+            return None
+
+    def update_trade_aths(self, updates):
+        """Persist new ATH prices and stop losses for open trades in one transaction"""
+        if not updates:
+            return
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                result = cursor.execute(
-                    """
-                    UPDATE trades
-                    SET status = 'Closed',
-                        exit_price = %s,
-                        exit_timestamp = %s,
-                        exit_reason = %s,
-                        pnl_amount = %s,
-                        pnl_percentage = %s,
-                        trade_duration = %s,
-                        notes = %s,
-                        max_drawdown = %s,
-                        max_profit = %s
-                    WHERE ticker = %s
-                    AND contract_address = %s
-                    AND status = 'Open'
-                    """,
-                    (
-                        trade_data["exit_price"],
-                        trade_data["exit_timestamp"],
-                        trade_data["exit_reason"],
-                        trade_data["pnl_amount"],
-                        trade_data["pnl_percentage"],
-                        trade_data["trade_duration"],
-                        trade_data["notes"],
-                        trade_data["max_drawdown"],
-                        trade_data["max_profit"],
-                        trade_data["ticker"],
-                        trade_data["contract_address"],
-                    ),
+                execute_values(
+                    cursor,
+                    UPDATE_TRADE_ATH_SQL,
+                    [
+                        (
+                            update["trade_id"],
+                            update["ath_price"],
+                            update["ath_timestamp"],
+                            update["stop_loss"],
+                        )
+                        for update in updates
+                    ],
+                    template=UPDATE_TRADE_ATH_TEMPLATE,
+                    page_size=WRITE_BATCH_SIZE,
                 )
                 conn.commit()
-                return cursor.rowcount > 0
         except Exception as e:
-            logger.error(f"Error in update_trade_exit: {str(e)}")
-            return False
+            logger.error(f"Error updating trade ATH and stop loss: {str(e)}")
+
+    @staticmethod
+    def _refresh_trade_stats(cursor):
+        """Recompute the trade_stats view without blocking its readers"""
+        try:
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY trade_stats")
+        except psycopg2.Error as e:
+            # The trade write itself already succeeded; stats catch up next time
+            logger.warning(f"Error refreshing trade stats: {str(e)}")
+
+    def _cached_trade_query(self, name, sql, fetch_all=False):
+        """Run an aggregate query over trades, reusing the result until trades change"""
+        generation = self._trade_generation
+        cached = self._stats_cache.get(name)
+        if cached and cached[0] == generation:
+            return cached[1]
+
+        with self.get_connection(autocommit=True) as conn:
+            cursor = conn.cursor(cursor_factory=DictCursor)
+            cursor.execute(sql)
+            result = cursor.fetchall() if fetch_all else cursor.fetchone()
+
+        self._stats_cache[name] = (generation, result)
+        return result
 
     def get_trade_statistics(self):
         """Get comprehensive trade statistics"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            return cursor.execute(
-                """
-                SELECT
-                    COUNT(*) as total_trades,
-                    SUM(CASE WHEN status = 'Closed' THEN 1 ELSE 0 END) as closed_trades,
-                    SUM(CASE WHEN exit_reason = 'Stop Loss' THEN 1 ELSE 0 END) as stopped_trades,
-                    AVG(CASE WHEN exit_reason = 'Stop Loss' THEN pnl_percentage ELSE NULL END) as avg_stop_loss_pnl,
-                    AVG(CASE WHEN status = 'Closed' THEN pnl_percentage ELSE NULL END) as avg_closed_trade_pnl,
-                    MIN(pnl_percentage) as worst_trade,
-                    MAX(pnl_percentage) as best_trade,
-                    AVG(max_drawdown) as avg_max_drawdown,
-                    AVG(max_profit) as avg_max_profit
-                FROM trades
-            """
-            ).fetchone()
+        return self._cached_trade_query("trade_statistics", TRADE_STATS_SQL)
 
     def get_exit_reason_distribution(self):
         """Get distribution of trade exit reasons"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            return cursor.execute(
-                """
-                SELECT
-                    exit_reason,
-                    COUNT(*) as count,
-                    AVG(pnl_percentage) as avg_pnl,
-                    AVG(trade_duration) as avg_duration
-                FROM trades
-                WHERE status = 'Closed'
-                GROUP BY exit_reason
+        # trade_duration holds str(timedelta), e.g. "1 day, 2:03:04"; drop the
+        # comma so Postgres can read it as an interval
+        return self._cached_trade_query(
+            "exit_reason_distribution",
             """
-            ).fetchall()
+            SELECT
+                exit_reason,
+                COUNT(*) as count,
+                AVG(pnl_percentage) as avg_pnl,
+                AVG(replace(trade_duration, ',', '')::interval) as avg_duration
+            FROM trades
+            WHERE status = 'Closed'
+            GROUP BY exit_reason
+        """,
+            fetch_all=True,
+        )
 
     def load_closed_trades(self):
         """Load closed trades from database"""
         try:
             with self.get_connection() as conn:
-                # Use DictCursor to get results as dictionaries
-                cursor = conn.cursor(cursor_factory=DictCursor)
+                # Server-side RealDictCursor so rows stream in itersize batches
+                cursor = conn.cursor(
+                    name="load_closed_trades", cursor_factory=RealDictCursor
+                )
+                cursor.itersize = LOADER_ITERSIZE
+                # Rows come back already shaped as PNL stats
                 cursor.execute(
                     """
-                    SELECT ticker, entry_price, timestamp as entry_timestamp,
-                           ai_agent, contract_address, network,
-                           exit_price, exit_timestamp, exit_reason,
-                           pnl_amount, pnl_percentage, ath_price,
-                           ath_timestamp, market_cap
+                    SELECT 'trade' AS type,
+                           ai_agent, ticker, contract_address, network, market_cap,
+                           to_char(timestamp, 'YYYY-MM-DD HH24:MI:SS') AS entry_time,
+                           entry_price::float8 AS entry_price,
+                           exit_price::float8 AS current_price,
+                           COALESCE(NULLIF(ath_price, 0), exit_price)::float8
+                               AS ath_price,
+                           ath_timestamp,
+                           pnl_percentage::float8 AS price_change_pct,
+                           100.0::float8 AS invested_amount,
+                           (100 * (1 + pnl_percentage / 100))::float8
+                               AS current_value,
+                           pnl_amount::float8 AS pnl_dollars,
+                           'Closed' AS status,
+                           exit_price::float8 AS exit_price,
+                           date_trunc('second', exit_timestamp) AS exit_timestamp,
+                           exit_reason
                     FROM trades
                     WHERE status = 'Closed'
-                    ORDER BY exit_timestamp DESC
+                    ORDER BY trades.exit_timestamp DESC
                 """
                 )
-                trades = cursor.fetchall()
-
-                closed_trades = []
-                for trade in trades:
-                    try:
-                        entry_timestamp = datetime.strptime(
-                            trade["entry_timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
-                            "%Y-%m-%d %H:%M:%S",
-                        )
-                    except ValueError:
-                        entry_timestamp = trade["entry_timestamp"]
-
-                    try:
-                        exit_timestamp = datetime.strptime(
-                            trade["exit_timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
-                            "%Y-%m-%d %H:%M:%S",
-                        )
-                    except ValueError:
-                        exit_timestamp = trade["exit_timestamp"]
-
-                    closed_trades.append(
-                        {
-                            "type": "trade",
-                            "ai_agent": trade["ai_agent"],
-                            "ticker": trade["ticker"],
-                            "contract_address": trade["contract_address"],
-                            "network": trade["network"],
-                            "market_cap": trade["market_cap"],
-                            "entry_time": entry_timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                            "entry_price": float(trade["entry_price"]),
-                            "current_price": float(trade["exit_price"]),
-                            "ath_price": (
-                                float(trade["ath_price"])
-                                if trade["ath_price"]
-                                else float(trade["exit_price"])
-                            ),
-                            "ath_timestamp": trade["ath_timestamp"],
-                            "price_change": f"{float(trade['pnl_percentage']):.2f}%",
-                            "invested_amount": 100.0,
-                            "current_value": 100.0
-                            * (1 + float(trade["pnl_percentage"]) / 100),
-                            "pnl_dollars": float(trade["pnl_amount"]),
-                            "status": "Closed",
-                            "exit_price": float(trade["exit_price"]),
-                            "exit_timestamp": exit_timestamp,
-                            "exit_reason": trade["exit_reason"],
-                        }
-                    )
-
-                return closed_trades
+                return list(cursor)
 
         except Exception as e:
             logger.error(f"Error loading closed trades: {str(e)}")
@@ -449,7 +939,7 @@ class Database:
     def get_active_user_trades_with_stop_loss(self):
         """Get all active user trades with stop loss set"""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(autocommit=True) as conn:
                 cursor = conn.cursor(cursor_factory=DictCursor)
                 cursor.execute(
                     """
@@ -475,7 +965,7 @@ class Database:
     def get_active_user_trades_with_take_profit(self):
         """Get all active user trades with take profit set"""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(autocommit=True) as conn:
                 cursor = conn.cursor(cursor_factory=DictCursor)
                 cursor.execute(
                     """
@@ -498,3 +988,59 @@ class Database:
         except Exception as e:
             logger.error(f"Error fetching user trades with take profit: {str(e)}")
             return []
+
+
+class DatabaseBatch:
+    """Write methods of a Database bound to one open transaction"""
+
+    def __init__(self, db: Database, conn):
+        self.db = db
+        self.conn = conn
+        self.trades_closed = False
+        self.after_commit_callbacks = []
+
+    def after_commit(self, callback):
+        """Defer a side effect of the batch's writes until the batch commits"""
+        self.after_commit_callbacks.append(callback)
+
+    def run_after_commit(self):
+        """Run the deferred side effects in the order they were registered"""
+        for callback in self.after_commit_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error running batch commit callback: {str(e)}")
+        self.after_commit_callbacks = []
+
+    def save_tweet(self, tweet, ticker, ticker_status, price_data, ai_agent) -> bool:
+        """Save a tweet inside the batch transaction"""
+        return self.db.save_tweet(
+            tweet, ticker, ticker_status, price_data, ai_agent, conn=self.conn
+        )
+
+    def is_tweet_processed(self, tweet_id: str, ai_agent: str) -> bool:
+        """Check the processed tweet cache"""
+        return self.db.is_tweet_processed(tweet_id, ai_agent)
+
+    def save_trade(self, trade_data):
+        """Save a trade inside the batch transaction"""
+        return self.db.save_trade(trade_data, conn=self.conn)
+
+    def update_trade_exit(self, trade_data):
+        """Close a trade inside the batch transaction"""
+        closed_trade = self.db.update_trade_exit(trade_data, conn=self.conn)
+        self.trades_closed = self.trades_closed or closed_trade is not None
+        return closed_trade
+
+    def commit(self):
+        """Commit the batch, rolling back if a write inside it failed"""
+        status = self.conn.get_transaction_status()
+        if status == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+            self.conn.rollback()
+            self.db._invalidate_write_caches()
+            raise psycopg2.DatabaseError("Batch rolled back after a failed write")
+        self.conn.commit()
+        if self.trades_closed:
+            with self.conn.cursor() as cursor:
+                self.db._refresh_trade_stats(cursor)
+            self.conn.commit()
@@ -1,13 +1,17 @@
 import logging
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from apexbt.tweet.tweet import TwitterManager, MockTweet
 from apexbt.database.database import Database
+from apexbt.database.async_database import AsyncDatabase
 from apexbt.trade.trade import TradeManager
-from apexbt.sheets.sheets import setup_google_sheets, get_twitter_accounts
-from apexbt.sheets.sheets import save_tweet as save_tweet_to_sheets
+from apexbt.sheets.sheets import (
+    TweetSheetWriter,
+    setup_google_sheets,
+    get_twitter_accounts,
+)
 from apexbt.crypto.codex import Codex
 from apexbt.trade_signal.trade_signal import SignalAPI
-from apexbt.agent.agent import TradeAgent
 from apexbt.crypto.dexscreener import DexScreener
 from apexbt.crypto.token_validator import TokenValidator, ValidationCriteria
 from apexbt.config.config import config
@@ -15,17 +19,41 @@ from apexbt.pumpfun.pumpfun import PumpFunManager
 from apexbt.virtuals.virtuals import VirtualsManager
 from datetime import datetime
 
+# uvloop does not support Windows; the default event loop is used there
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Threads reserved for sentiment calls, which can sit behind the model's rate
+# limiter for seconds and would otherwise hold the shared to_thread workers
+SENTIMENT_WORKERS = 4
+
+# Items each monitor may buffer for processing before the oldest are dropped
+PROCESS_QUEUE_SIZE = 256
+
+# Items from one monitor processed at once; a later tweet about a token can
+# therefore open its trade before an earlier one
+PROCESS_WORKERS = 8
+
 
 class Apexbt:
     def __init__(self):
         self.db = Database()
+        self.async_db = AsyncDatabase(self.db)
         self.sheets = None
+        self.tweets_ws = None
+        self.accounts_ws = None
+        self.tweet_sheet = None
         self.trade_manager = None
         self.trade_agent = None
+        self.sentiment_executor = ThreadPoolExecutor(
+            max_workers=SENTIMENT_WORKERS, thread_name_prefix="sentiment"
+        )
         self.twitter_manager = None
         self.pumpfun_manager = None
         self.virtuals_manager = None
@@ -34,6 +62,8 @@ class Apexbt:
         self.twitter_validator = None
         self.pumpfun_validator = None
         self.virtuals_validator = None
+        # (queue, process) per monitor, drained by workers in run_async
+        self.process_queues = []
 
     def initialize(self):
         """Initialize all components"""
@@ -42,9 +72,12 @@ class Apexbt:
 
         # Initialize Google Sheets
         self.sheets = setup_google_sheets()
+        if self.sheets:
+            self.tweets_ws = self.sheets.get("tweets")
+            self.accounts_ws = self.sheets.get("accounts")
 
-        if self.sheets and "accounts" in self.sheets:
-            self.twitter_users = get_twitter_accounts(self.sheets["accounts"])
+        if self.accounts_ws is not None:
+            self.twitter_users = get_twitter_accounts(self.accounts_ws)
             if not self.twitter_users:
                 logger.warning(
                     "No Twitter accounts found in Accounts sheet. Using config defaults."
@@ -58,10 +91,14 @@ class Apexbt:
         self.twitter_manager = TwitterManager(self.db)
 
         # Initialize PumpFun manager
-        self.pumpfun_manager = PumpFunManager(callback=self.process_new_token)
+        self.pumpfun_manager = PumpFunManager(
+            callback=self._queued(self.process_new_token)
+        )
 
         # Initialize Virtuals manager
-        self.virtuals_manager = VirtualsManager(callback=self.process_new_token)
+        self.virtuals_manager = VirtualsManager(
+            callback=self._queued(self.process_new_token)
+        )
 
         # Initialize Trade manager and Signal API
         self.trade_manager = TradeManager(
@@ -71,7 +108,10 @@ class Apexbt:
         signal_api = SignalAPI()
         self.trade_manager.set_signal_api(signal_api)
 
-        # Initialize Trade agent
+        # Initialize Trade agent; LangChain is by far the heaviest import, so
+        # only pay for it once the bot is actually starting
+        from apexbt.agent.agent import TradeAgent
+
         self.trade_agent = TradeAgent()
 
         # Create two validators with different criteria
@@ -85,6 +125,33 @@ class Apexbt:
             criteria=ValidationCriteria.virtuals_default()
         )
 
+    def _queued(self, process):
+        """Return a monitor callback that queues items for process
+
+        Monitors then go straight back to polling instead of waiting on
+        sentiment and price lookups; a full queue drops its oldest item.
+        """
+        queue = asyncio.Queue(maxsize=PROCESS_QUEUE_SIZE)
+        self.process_queues.append((queue, process))
+
+        async def enqueue(item):
+            if queue.full():
+                queue.get_nowait()
+                logger.warning("Processing queue full, dropped the oldest item")
+            queue.put_nowait(item)
+
+        return enqueue
+
+    @staticmethod
+    async def _process_queue(queue, process):
+        """Process queued items until cancelled
+
+        run_async starts PROCESS_WORKERS of these per queue, so items from one
+        monitor are processed concurrently and can finish out of order.
+        """
+        while True:
+            await process(await queue.get())
+
     async def process_new_token(self, token_info):
         """Process new tokens from PumpFun"""
         try:
@@ -99,7 +166,9 @@ class Apexbt:
                 created_at = datetime.now()
             elif isinstance(created_at, str):
                 try:
-                    created_at = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
+                    # C parser; covers both "YYYY-MM-DD HH:MM:SS" and the
+                    # isoformat() strings the Virtuals SDK produces
+                    created_at = datetime.fromisoformat(created_at)
                 except ValueError:
                     created_at = datetime.now()
 
@@ -114,10 +183,11 @@ class Apexbt:
                 return
 
             # Get token data from DexScreener
-            dex_data = self.dex_screener.get_token_by_address(contract_address, network)
+            dex_data = await asyncio.to_thread(
+                self.dex_screener.get_token_by_address, contract_address, network
+            )
 
             if dex_data:
-                dex_data["address"] = contract_address
                 # Select appropriate validator based on author
                 if token_info["author"] == "pump.fun":
                     validator = self.pumpfun_validator
@@ -128,26 +198,31 @@ class Apexbt:
                     return
 
                 # Validate token
-                symbol = dex_data.get("token_symbol", "NOT FOUND")
+                symbol = dex_data.token_symbol or "NOT FOUND"
                 is_valid, reason = validator.validate_token(dex_data)
                 if not is_valid:
                     logger.info(f"Token {symbol} validation failed: {reason}")
                     return
 
-                market_cap = dex_data.get("market_cap")
+                market_cap = dex_data.market_cap
 
-                # Get holders data from Codex
-                holders_data = Codex.get_token_holders(
-                    contract_address=contract_address,
-                    network=network,
+                # Get holders and price data from Codex concurrently
+                holders_data, price_data = await asyncio.gather(
+                    asyncio.to_thread(
+                        Codex.get_token_holders,
+                        contract_address=contract_address,
+                        network=network,
+                    ),
+                    asyncio.to_thread(
+                        Codex.get_crypto_price, contract_address, network
+                    ),
                 )
 
                 holder_count = holders_data.get("total_count", 0) if holders_data else 0
 
-                # Get price data from Codex
-                price_data = Codex.get_crypto_price(contract_address, network)
-
                 if price_data and price_data.get("price"):
+                    entry_price = float(price_data["price"])
+
                     # Create mock tweet for compatibility
                     mock_tweet = MockTweet(
                         id=token_info["id"],
@@ -157,7 +232,7 @@ class Apexbt:
                     )
 
                     # Save to database and sheets
-                    self.save_to_both(
+                    await self.save_to_both(
                         mock_tweet,
                         symbol,
                         "Single ticker",
@@ -170,16 +245,14 @@ class Apexbt:
                         symbol,
                         contract_address,
                         str(token_info["id"]),
-                        float(price_data["price"]),
+                        entry_price,
                         token_info["author"],
                         network,
                         entry_timestamp=token_info["created_at"],
                         market_cap=market_cap,
                         holder_count=holder_count,
                     ):
-                        logger.info(
-                            f"Opened new trade for {symbol} at {price_data['price']}"
-                        )
+                        logger.info(f"Opened new trade for {symbol} at {entry_price}")
                 else:
                     logger.warning(f"No price data found from Codex for {symbol}")
             else:
@@ -191,6 +264,12 @@ class Apexbt:
     async def process_new_tweet(self, tweet):
         """Process a single new tweet in real-time"""
         try:
+            # Extract ticker from tweet first; it is the cheapest filter and
+            # tweets without a single ticker are never stored
+            ticker, ticker_status = TwitterManager.extract_ticker(tweet.text)
+            if not ticker:
+                return
+
             # Skip if tweet has already been processed
             if self.db.is_tweet_processed(tweet.id, tweet.author):
                 logger.info(
@@ -198,49 +277,64 @@ class Apexbt:
                 )
                 return
 
-            # Extract ticker from tweet
-            ticker, ticker_status = TwitterManager.extract_ticker(tweet.text)
-            if not ticker:
-                return
+            # Sentiment analysis is a slow model call; run it while DexScreener
+            # resolves the contract and wait for it before acting on either
+            sentiment = asyncio.get_running_loop().run_in_executor(
+                self.sentiment_executor,
+                self.trade_agent.should_take_trade,
+                tweet.text,
+                ticker,
+            )
+
+            # First get contract/network from DexScreener
+            dex_data = None
+            if ticker_status == "Single ticker":
+                dex_data = await asyncio.to_thread(
+                    self.dex_screener.get_token_by_ticker, ticker
+                )
 
             # Only reject if we're confident about negative sentiment
-            if not self.trade_agent.should_take_trade(tweet.text, ticker):
+            if not await sentiment:
                 logger.info("Trade rejected due to negative sentiment")
                 return
 
             # Get price data for single ticker
             price_data = None
             if ticker_status == "Single ticker":
-                # First get contract/network from DexScreener
-                dex_data = self.dex_screener.get_token_by_ticker(ticker)
-
                 if dex_data:
                     is_valid, reason = self.twitter_validator.validate_token(dex_data)
                     if not is_valid:
                         logger.info(f"Token {ticker} validation failed: {reason}")
                         return
-                    contract_address = dex_data.get("contract_address")
-                    network = dex_data.get("network")
-                    market_cap = dex_data.get("market_cap")
+                    contract_address = dex_data.contract_address
+                    network = dex_data.network
+                    market_cap = dex_data.market_cap
 
                     logger.info(
                         f"Found contract {contract_address} on network {network} for {ticker}"
                     )
 
-                    # Use contract info to get current price from Codex
-                    price_data = Codex.get_crypto_price(contract_address, network)
-
-                    holders_data = Codex.get_token_holders(
-                        contract_address=contract_address,
-                        network=network,
+                    # Use contract info to get current price and holders from
+                    # Codex; the two queries are independent
+                    price_data, holders_data = await asyncio.gather(
+                        asyncio.to_thread(
+                            Codex.get_crypto_price, contract_address, network
+                        ),
+                        asyncio.to_thread(
+                            Codex.get_token_holders,
+                            contract_address=contract_address,
+                            network=network,
+                        ),
                     )
                     holder_count = (
                         holders_data.get("total_count", 0) if holders_data else 0
                     )
 
                     if price_data and price_data.get("price"):
+                        entry_price = float(price_data["price"])
+
                         # Save tweet to both database and sheets
-                        self.save_to_both(
+                        await self.save_to_both(
                             tweet, ticker, ticker_status, price_data, tweet.author
                         )
 
@@ -249,7 +343,7 @@ class Apexbt:
                             ticker,
                             price_data["contract_address"],
                             str(tweet.id),
-                            float(price_data["price"]),
+                            entry_price,
                             tweet.author,
                             network,
                             entry_timestamp=tweet.created_at,
@@ -257,7 +351,7 @@ class Apexbt:
                             holder_count=holder_count,
                         ):
                             logger.info(
-                                f"Opened new trade for {ticker} at {price_data['price']} by {tweet.author}"
+                                f"Opened new trade for {ticker} at {entry_price} by {tweet.author}"
                             )
                     else:
                         logger.warning(f"No price data found from Codex for {ticker}")
@@ -283,11 +377,22 @@ class Apexbt:
         self.trade_manager.start_monitoring(sheets=self.sheets)
         logger.info("Trade manager started successfully")
 
+        await self.async_db.connect()
+        sheets_task = None
+        if self.tweets_ws is not None:
+            self.tweet_sheet = TweetSheetWriter(self.tweets_ws)
+            sheets_task = asyncio.create_task(self.tweet_sheet.run())
+        twitter_callback = self._queued(self.process_new_tweet)
+        workers = [
+            asyncio.create_task(self._process_queue(queue, process))
+            for queue, process in self.process_queues
+            for _ in range(PROCESS_WORKERS)
+        ]
         try:
             twitter_task = asyncio.create_task(
                 self.twitter_manager.monitor(
                     usernames=self.twitter_users,
-                    callback=self.process_new_tweet,
+                    callback=twitter_callback,
                 )
             )
             pumpfun_task = asyncio.create_task(self.pumpfun_manager.monitor())
@@ -304,25 +409,34 @@ class Apexbt:
             self.trade_manager.stop_monitoring()
             self.pumpfun_manager.stop()
             self.virtuals_manager.stop()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if sheets_task is not None:
+                # Cancelling flushes the rows still buffered
+                sheets_task.cancel()
+                await asyncio.gather(sheets_task, return_exceptions=True)
+            await self.async_db.close()
+            self.sentiment_executor.shutdown(wait=False)
 
     def run(self):
         """Main execution method"""
+        if uvloop is not None:
+            uvloop.install()
         asyncio.run(self.run_async())
 
-    def save_to_both(self, tweet, ticker, ticker_status, price_data, ai_agent):
+    async def save_to_both(self, tweet, ticker, ticker_status, price_data, ai_agent):
         """Save data to both database and Google Sheets"""
-        # Save to database
-        self.db.save_tweet(tweet, ticker, ticker_status, price_data, ai_agent)
-
-        # Save to Google Sheets if available
-        if self.sheets and "tweets" in self.sheets:
-            save_tweet_to_sheets(
-                self.sheets["tweets"],
-                tweet,
-                ticker,
-                ticker_status,
-                price_data,
-                ai_agent,
+        # Save to database without blocking the event loop
+        await self.async_db.save_tweet(
+            tweet, ticker, ticker_status, price_data, ai_agent
+        )
+
+        # Queue for the next batched Google Sheets append if available
+        if self.tweet_sheet is not None:
+            self.tweet_sheet.save_tweet(
+                tweet, ticker, ticker_status, price_data, ai_agent
             )
 
 
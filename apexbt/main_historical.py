@@ -5,27 +5,48 @@ from apexbt.crypto.dexscreener import DexScreener
 from apexbt.trade.trade import TradeManager
 from apexbt.tweet.tweet import TwitterManager
 from apexbt.sheets.sheets import (
+    TweetSheetWriter,
     setup_google_sheets,
-    save_tweet as save_tweet_to_sheets,
     get_twitter_accounts,
 )
+import asyncio
 import time
 import logging
+import threading
+from collections import OrderedDict
+from functools import partial
 from apexbt.config.config import config
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tweets whose DexScreener/Codex lookups may be in flight at once
+HISTORICAL_LOOKUP_CONCURRENCY = 8
+
+# Users whose timelines are fetched from Twitter at once
+HISTORICAL_USER_CONCURRENCY = 3
+
+# Historical prices kept in memory, keyed by (contract, network, minute bucket)
+PRICE_CACHE_SIZE = 4096
+
 
 class ApexbtHistorical:
     def __init__(self):
         self.db = Database(historical=True)
         self.sheets = None
+        self.tweet_sheet = None
+        # Loop running tweet_sheet; rows are handed to it from worker threads
+        self.sheet_loop = None
         self.trade_manager = None
         self.twitter_manager = None
         self.dex_screener = DexScreener()
         self.twitter_users = []
+        self.price_cache = OrderedDict()
+        self.price_cache_lock = threading.Lock()
+        # Serialises tweet and trade writes across the concurrently processed
+        # users, so checking for an open trade and opening one stay atomic
+        self.write_lock = threading.Lock()
 
     def initialize(self):
         """Initialize components"""
@@ -48,121 +69,237 @@ class ApexbtHistorical:
             historical=True,
         )
 
-    def save_to_both(self, tweet, ticker, ticker_status, price_data, ai_agent):
+    def save_to_both(
+        self, tweet, ticker, ticker_status, price_data, ai_agent, batch=None
+    ):
         """Save data to both historical database and historical Google Sheets"""
-        # Save to historical database
-        self.db.save_tweet(tweet, ticker, ticker_status, price_data, ai_agent)
+        # Save to historical database, inside the caller's batch if given
+        (batch or self.db).save_tweet(
+            tweet, ticker, ticker_status, price_data, ai_agent
+        )
 
-        # Save to historical Google Sheets if available
-        if self.sheets and "tweets" in self.sheets:
-            save_tweet_to_sheets(
-                self.sheets["tweets"],
+        # Queue for the next batched historical Google Sheets append if
+        # available, once the batch holding the tweet has committed. This runs
+        # in a worker thread, so the row is handed to the writer's loop.
+        if self.tweet_sheet:
+            save_tweet_to_sheet = partial(
+                self.sheet_loop.call_soon_threadsafe,
+                self.tweet_sheet.save_tweet,
                 tweet,
                 ticker,
                 ticker_status,
                 price_data,
                 ai_agent,
             )
+            if batch is not None:
+                batch.after_commit(save_tweet_to_sheet)
+            else:
+                save_tweet_to_sheet()
 
-    def process_tweets(self, tweets):
-        """Process a list of tweets and save to historical database"""
-        self.trade_manager.start_monitoring(self.sheets)
+    def lookup_historical_price(self, tweet, ticker):
+        """Look up the token on DexScreener and its price at tweet time on Codex
+
+        Returns (dex_data, historical_price_data); either may be None.
+        """
+        # First get contract/network from DexScreener
+        dex_data = self.dex_screener.get_token_by_ticker(ticker)
+        if not dex_data:
+            return None, None
+
+        logger.info(
+            f"Found contract {dex_data.contract_address} on network {dex_data.network} for {ticker}"
+        )
+
+        return dex_data, self.get_historical_price(
+            dex_data.contract_address,
+            dex_data.network,
+            int(tweet.created_at.timestamp()),
+        )
 
+    def get_historical_price(self, contract_address, network, timestamp):
+        """Get the price at a tweet's timestamp, shared across its minute
+
+        Checks the in-memory LRU, then the price_cache table, and only then
+        asks Codex at the timestamp itself; historical prices never change,
+        so hits are always valid.
+        """
+        # Tweets about the same token in the same minute share one price, the
+        # one looked up at the first of them to miss the cache
+        key = (contract_address, network, timestamp // 60)
+        with self.price_cache_lock:
+            if key in self.price_cache:
+                self.price_cache.move_to_end(key)
+                return self.price_cache[key]
+
+        price_data = self.db.get_cached_price(*key)
+        if price_data is None:
+            prices = Codex.get_historical_prices(contract_address, [timestamp], network)
+            if not prices:
+                return None
+            price_data = prices[0]
+            self.db.save_cached_price(*key, price_data)
+
+        with self.price_cache_lock:
+            self.price_cache[key] = price_data
+            while len(self.price_cache) > PRICE_CACHE_SIZE:
+                self.price_cache.popitem(last=False)
+        return price_data
+
+    async def _lookup_historical_price(self, tweet, ticker, semaphore):
+        """Run lookup_historical_price off the event loop, bounded by semaphore"""
+        async with semaphore:
+            return await asyncio.to_thread(self.lookup_historical_price, tweet, ticker)
+
+    def select_unprocessed_tweets(self, tweets):
+        """Return (tweet, ticker, ticker_status) for new tweets naming a ticker"""
+        candidates = []
         for tweet in tweets:
-            try:
-                # Check historical database
-                if self.db.is_tweet_processed(tweet.id, tweet.author):
-                    logger.info(
-                        f"Tweet {tweet.id} from {tweet.author} already processed, skipping..."
-                    )
-                    continue
+            # Check historical database
+            if self.db.is_tweet_processed(tweet.id, tweet.author):
+                logger.info(
+                    f"Tweet {tweet.id} from {tweet.author} already processed, skipping..."
+                )
+                continue
 
-                ticker, ticker_status = TwitterManager.extract_ticker(tweet.text)
-                if not ticker:
-                    continue
+            ticker, ticker_status = TwitterManager.extract_ticker(tweet.text)
+            if ticker:
+                candidates.append((tweet, ticker, ticker_status))
+        return candidates
 
-                price_data = None
-                if ticker_status == "Single ticker":
-                    # First get contract/network from DexScreener
-                    dex_data = self.dex_screener.get_token_market_data(ticker)
+    def save_historical_tweet(self, tweet, ticker, ticker_status, price_data, dex_data):
+        """Write a tweet and, if it was priced, its trade in one transaction"""
+        with self.write_lock:
+            # The tweet goes first since the trade references it
+            with self.db.batch() as batch:
+                self.save_to_both(
+                    tweet, ticker, ticker_status, price_data, tweet.author, batch
+                )
 
-                    if dex_data:
-                        contract_address = dex_data.get("contract_address")
-                        network = dex_data.get("network")
-                        market_cap = dex_data.get("market_cap")
+                if price_data:
+                    entry_price = float(price_data["price"])
+                    if self.trade_manager.add_trade(
+                        ticker,
+                        price_data["contract_address"],
+                        str(tweet.id),
+                        entry_price,
+                        tweet.author,
+                        dex_data.network,
+                        entry_timestamp=tweet.created_at,
+                        market_cap=dex_data.market_cap,
+                        batch=batch,
+                    ):
                         logger.info(
-                            f"Found contract {contract_address} on network {network} for {ticker}"
+                            f"Opened new historical trade for {ticker} at {entry_price}"
                         )
 
-                        # Convert tweet creation time to Unix timestamp
-                        tweet_timestamp = int(tweet.created_at.timestamp())
+    async def process_tweets(self, tweets):
+        """Process a list of tweets and save to historical database"""
+        # The first processed check loads the tweets table, and every write is
+        # a blocking database call, so all of it runs off the event loop
+        candidates = await asyncio.to_thread(self.select_unprocessed_tweets, tweets)
 
-                        # Use contract info to get historical price from Codex
-                        price_data = Codex.get_historical_prices(
-                            contract_address, [tweet_timestamp], network
-                        )
+        # Price lookups are pure network I/O, so run them concurrently; Codex's
+        # rate limiter and DexScreener's retry policy keep them within limits
+        semaphore = asyncio.Semaphore(HISTORICAL_LOOKUP_CONCURRENCY)
+        lookups = await asyncio.gather(
+            *(
+                self._lookup_historical_price(tweet, ticker, semaphore)
+                for tweet, ticker, ticker_status in candidates
+                if ticker_status == "Single ticker"
+            ),
+            return_exceptions=True,
+        )
+        lookups = iter(lookups)
+
+        # Open trades and save tweets in tweet order so the earliest call on a
+        # token is the one that opens the trade
+        for tweet, ticker, ticker_status in candidates:
+            try:
+                price_data = None
+                if ticker_status == "Single ticker":
+                    lookup = next(lookups)
+                    if isinstance(lookup, Exception):
+                        raise lookup
+                    dex_data, historical_price_data = lookup
 
-                        if price_data and len(price_data) > 0:
-                            historical_price_data = price_data[0]
-
-                            if self.trade_manager.add_trade(
-                                ticker,
-                                historical_price_data["contract_address"],
-                                str(tweet.id),
-                                float(historical_price_data["price"]),
-                                tweet.author,
-                                network,
-                                entry_timestamp=tweet.created_at,
-                                market_cap=market_cap,
-                            ):
-                                logger.info(
-                                    f"Opened new historical trade for {ticker} at {historical_price_data['price']}"
-                                )
-
-                            # Use the historical price data for saving
-                            price_data = historical_price_data
-                        else:
-                            logger.warning(
-                                f"No historical price data found from Codex for {ticker}"
-                            )
+                    if dex_data and historical_price_data:
+                        # Use the historical price data for saving
+                        price_data = historical_price_data
+                    elif dex_data:
+                        logger.warning(
+                            f"No historical price data found from Codex for {ticker}"
+                        )
                     else:
                         logger.warning(
                             f"Could not find token info on DexScreener for {ticker}"
                         )
 
-                # Save to both historical database and sheets
-                self.save_to_both(
-                    tweet, ticker, ticker_status, price_data, tweet.author
+                await asyncio.to_thread(
+                    self.save_historical_tweet,
+                    tweet,
+                    ticker,
+                    ticker_status,
+                    price_data,
+                    dex_data,
                 )
-                time.sleep(1)
 
             except Exception as e:
                 logger.error(f"Error processing historical tweet: {str(e)}")
-                time.sleep(2)
                 continue
 
-    def process_user_historical_tweets(
-        self, username, start_date, current_user_num, total_users
+    async def process_user_historical_tweets(
+        self, username, start_date, current_user_num, total_users, semaphore
     ):
         """Process historical tweets for a single user"""
-        logger.info(
-            f"\nProcessing historical data for user {current_user_num}/{total_users}: @{username}"
-        )
+        # Only the Twitter fetch is bounded; price lookups have their own limit
+        async with semaphore:
+            logger.info(
+                f"\nProcessing historical data for user {current_user_num}/{total_users}: @{username}"
+            )
+            user_tweets = await asyncio.to_thread(
+                self.twitter_manager.fetch_historical_tweets, username, start_date
+            )
 
-        user_tweets = self.twitter_manager.fetch_historical_tweets(username, start_date)
         if user_tweets:
             user_tweets.sort(key=lambda x: x.created_at)
             logger.info(f"Found {len(user_tweets)} historical tweets from @{username}")
-            self.process_tweets(user_tweets)
+            await self.process_tweets(user_tweets)
         else:
             logger.info(f"No historical tweets found for @{username}")
 
-        if current_user_num < total_users:
-            delay = 60
-            logger.info(
-                f"Waiting {delay}s before processing next user's historical data..."
+    async def process_all_users(self, start_date):
+        """Process historical tweets for every configured user concurrently"""
+        semaphore = asyncio.Semaphore(HISTORICAL_USER_CONCURRENCY)
+        total_users = len(self.twitter_users)
+
+        sheets_task = None
+        if self.sheets and "tweets" in self.sheets:
+            self.tweet_sheet = TweetSheetWriter(self.sheets["tweets"])
+            self.sheet_loop = asyncio.get_running_loop()
+            sheets_task = asyncio.create_task(self.tweet_sheet.run())
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    self.process_user_historical_tweets(
+                        username, start_date, i, total_users, semaphore
+                    )
+                    for i, username in enumerate(self.twitter_users, 1)
+                ),
+                return_exceptions=True,
             )
-            time.sleep(delay)
+        finally:
+            if sheets_task is not None:
+                # Cancelling flushes the rows still buffered
+                sheets_task.cancel()
+                await asyncio.gather(sheets_task, return_exceptions=True)
+                self.tweet_sheet = None
+                self.sheet_loop = None
+        for username, result in zip(self.twitter_users, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error processing historical data for @{username}: {str(result)}"
+                )
 
     def run_historical_analysis(self, start_date=None):
         """Run analysis on historical tweets from multiple users"""
@@ -177,16 +314,7 @@ class ApexbtHistorical:
         if self.twitter_manager.verify_credentials():
             self.trade_manager.start_monitoring(self.sheets)
 
-            for i, username in enumerate(self.twitter_users, 1):
-                try:
-                    self.process_user_historical_tweets(
-                        username, start_date, i, len(self.twitter_users)
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error processing historical data for @{username}: {str(e)}"
-                    )
-                    continue
+            asyncio.run(self.process_all_users(start_date))
 
             try:
                 while True:
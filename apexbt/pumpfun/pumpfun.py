@@ -1,6 +1,7 @@
 import asyncio
 import websockets
 import json
+import orjson
 import logging
 from typing import Callable, Optional
 
@@ -34,7 +35,7 @@ class PumpFunManager:
     async def process_message(self, message: str):
         """Process incoming websocket messages"""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
 
             token_info = {
                 "id": data.get("signature", ""),  # Use signature as ID
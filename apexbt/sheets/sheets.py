@@ -1,4 +1,5 @@
 # sheets.py
+import asyncio
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from apexbt.config.config import config
@@ -49,6 +50,39 @@ class RateLimiter:
 # Create a global rate limiter instance
 sheet_rate_limiter = RateLimiter(max_requests_per_minute=50)  # Conservative limit
 
+# Most tweet rows TweetSheetWriter appends in one request
+TWEET_FLUSH_ROWS = 100
+
+# Seconds TweetSheetWriter waits for more rows before appending a partial batch
+TWEET_FLUSH_INTERVAL = 2
+
+# Longest pause, in seconds, between retries while the Sheets quota is exhausted
+QUOTA_BACKOFF_MAX = 60
+
+# Append attempts per batch while the quota is exhausted before its rows are
+# dropped, and the smaller number allowed for the final flush at shutdown
+QUOTA_RETRY_ATTEMPTS = 8
+SHUTDOWN_RETRY_ATTEMPTS = 2
+
+# Tweet rows buffered by TweetSheetWriter; the oldest are dropped beyond this
+TWEET_QUEUE_SIZE = 10_000
+
+# price_data keys written to the Tweets worksheet, in column order
+TWEET_PRICE_FIELDS = (
+    "price",
+    "volume_24h",
+    "liquidity",
+    "percent_change_24h",
+    "dex",
+    "network",
+    "pair_name",
+    "contract_address",
+    "last_updated",
+)
+
+# Price cells for tweets that have no price data
+NO_PRICE_CELLS = ["N/A"] * len(TWEET_PRICE_FIELDS)
+
 
 def setup_google_sheets(historical=False):
     """Setup Google Sheets connection with multiple worksheets"""
@@ -265,31 +299,33 @@ def get_twitter_accounts(sheet):
         return []
 
 
+def tweet_row(tweet, ticker, ticker_status, price_data, ai_agent):
+    """Build the Tweets worksheet row for a tweet"""
+    row = [
+        str(tweet.id),
+        ai_agent,
+        tweet.text,
+        str(tweet.created_at),
+        str(datetime.now()),
+        ticker if ticker else "N/A",
+        ticker_status,
+        "N/A",  # Current Price USD
+    ]
+
+    # Tweets without price data skip the per-field lookups entirely
+    if price_data:
+        get = price_data.get
+        row.extend([get(field, "N/A") for field in TWEET_PRICE_FIELDS])
+    else:
+        row.extend(NO_PRICE_CELLS)
+    return row
+
+
 def save_tweet(sheet, tweet, ticker, ticker_status, price_data, ai_agent):
     try:
         sheet_rate_limiter.wait_if_needed()
 
-        price_data = price_data or {}
-
-        row = [
-            str(tweet.id),
-            ai_agent,
-            tweet.text,
-            str(tweet.created_at),
-            str(datetime.now()),
-            ticker if ticker else "N/A",
-            ticker_status,
-            "N/A",  # Current Price USD
-            price_data.get("price", "N/A"),
-            price_data.get("volume_24h", "N/A"),
-            price_data.get("liquidity", "N/A"),
-            price_data.get("percent_change_24h", "N/A"),
-            price_data.get("dex", "N/A"),
-            price_data.get("network", "N/A"),
-            price_data.get("pair_name", "N/A"),
-            price_data.get("contract_address", "N/A"),
-            price_data.get("last_updated", "N/A"),
-        ]
+        row = tweet_row(tweet, ticker, ticker_status, price_data, ai_agent)
 
         sheet.append_row(row)
         logger.info(f"Tweet saved to Google Sheets: {tweet.id}")
@@ -298,6 +334,79 @@ def save_tweet(sheet, tweet, ticker, ticker_status, price_data, ai_agent):
         logger.error(f"Error saving to Google Sheets: {str(e)}")
 
 
+class TweetSheetWriter:
+    """Buffer tweet rows and append them to the Tweets worksheet in batches
+
+    run() must be running as a task on the loop that calls save_tweet.
+    """
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.queue = asyncio.Queue(maxsize=TWEET_QUEUE_SIZE)
+
+    def save_tweet(self, tweet, ticker, ticker_status, price_data, ai_agent):
+        """Queue a tweet row for the next batch"""
+        if self.queue.full():
+            # Sheets has been failing for a while; keep the newest rows
+            self.queue.get_nowait()
+            logger.warning("Tweet sheet queue full, dropping oldest row")
+        self.queue.put_nowait(
+            tweet_row(tweet, ticker, ticker_status, price_data, ai_agent)
+        )
+
+    async def run(self):
+        """Append queued rows until cancelled, then write whatever is left"""
+        loop = asyncio.get_running_loop()
+        rows = []
+        try:
+            while True:
+                rows.append(await self.queue.get())
+                deadline = loop.time() + TWEET_FLUSH_INTERVAL
+                while len(rows) < TWEET_FLUSH_ROWS:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                batch, rows = rows, []
+                await asyncio.to_thread(self.append_rows, batch)
+        finally:
+            while not self.queue.empty():
+                rows.append(self.queue.get_nowait())
+            if rows:
+                await asyncio.to_thread(self.append_rows, rows, SHUTDOWN_RETRY_ATTEMPTS)
+
+    def append_rows(self, rows, attempts=QUOTA_RETRY_ATTEMPTS):
+        """Append rows in one request, backing off while the quota is exhausted"""
+        delay = 1
+        for attempt in range(1, attempts + 1):
+            try:
+                sheet_rate_limiter.wait_if_needed()
+                self.sheet.append_rows(rows)
+                logger.info(f"Saved {len(rows)} tweets to Google Sheets")
+                return
+            except gspread.exceptions.APIError as e:
+                if e.response.status_code != 429:
+                    logger.error(f"Error saving to Google Sheets: {str(e)}")
+                    return
+                if attempt == attempts:
+                    break
+                # Keep the rows and retry once the quota window has moved on
+                logger.warning(f"Google Sheets quota exceeded, retrying in {delay}s")
+                time.sleep(delay)
+                delay = min(delay * 2, QUOTA_BACKOFF_MAX)
+            except Exception as e:
+                logger.error(f"Error saving to Google Sheets: {str(e)}")
+                return
+        logger.error(
+            f"Google Sheets quota still exceeded after {attempts} attempts, "
+            f"dropping {len(rows)} tweet rows"
+        )
+
+
 def save_trade(sheet, trade_data, pnl_sheet):
     """Save trade information to the Trades worksheet and update PNL"""
     try:
@@ -727,9 +836,7 @@ def format_trade_row(trade, status):
         stop_loss = ath_price * config.STOP_LOSS_PERCENTAGE
 
         # Calculate percentages
-        price_change = float(
-            str(trade["price_change"]).replace("%", "").replace(",", "")
-        )
+        price_change = trade["price_change_pct"]
         from_ath = ((current_price - ath_price) / ath_price * 100) if ath_price else 0
         to_stop_loss = (current_price - stop_loss) / current_price * 100
 
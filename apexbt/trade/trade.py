@@ -2,18 +2,27 @@
 import time
 import threading
 import logging
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional
 from datetime import datetime
 from apexbt.crypto.codex import Codex
 from apexbt.config.config import config
-from apexbt.database.database import Database
+from apexbt.database.database import LOADER_ITERSIZE, Database, DatabaseBatch
 from apexbt.crypto.sniffer import SolSnifferAPI
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _trade_id(dt: datetime) -> str:
+    """Build a trade id from its entry time, down to the microsecond"""
+    # Same digits as strftime("%Y%m%d%H%M%S%f") without parsing a format string
+    return (
+        f"T{dt.year:04d}{dt.month:02d}{dt.day:02d}"
+        f"{dt.hour:02d}{dt.minute:02d}{dt.second:02d}{dt.microsecond:06d}"
+    )
+
+
 @dataclass
 class TradePosition:
     ticker: str
@@ -27,8 +36,12 @@ class TradePosition:
     ath_timestamp: datetime = None
     stop_loss: float = None
     market_cap: float = None
+    trade_id: str = None
+    # Lowercased contract address, the form every lookup and comparison uses
+    contract_key: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        self.contract_key = self.contract_address.lower()
         # Initialize ATH with entry price if not set
         if self.ath_price is None:
             self.ath_price = self.entry_price
@@ -60,8 +73,14 @@ class TradeManager:
         self.update_interval = update_interval
         self.historical = historical
         self.active_trades: List[TradePosition] = []
+        # (ticker, contract) of every open trade, lowercased, for add_trade's
+        # duplicate check
+        self.open_trade_keys = set()
         self.is_running = False
         self.update_thread = None
+        # Set when trades change so the monitor refreshes without waiting out
+        # the full update interval
+        self.stats_dirty = threading.Event()
         self.last_update = 0
         self.MIN_UPDATE_INTERVAL = 2
         self.sheets = None
@@ -75,6 +94,7 @@ class TradeManager:
         """Load active trades from database"""
         trades = self.db.load_active_trades()
         self.active_trades = [TradePosition(**trade) for trade in trades]
+        self._refresh_open_trade_keys()
         logger.info(f"Loaded {len(self.active_trades)} active trades")
 
     def start_monitoring(self, sheets=None):
@@ -89,6 +109,7 @@ class TradeManager:
     def stop_monitoring(self):
         """Stop the monitoring thread"""
         self.is_running = False
+        self.stats_dirty.set()
         if self.update_thread:
             self.update_thread.join()
             logger.info("Trade monitoring stopped")
@@ -96,12 +117,18 @@ class TradeManager:
     def _monitor_trades(self):
         """Monitor trades and update prices periodically"""
         while self.is_running:
+            delay = self.update_interval
             try:
+                self.stats_dirty.clear()
                 self.update_trade_prices(sheets=self.sheets)
-                time.sleep(self.update_interval)
             except Exception as e:
                 logger.error(f"Error in trade monitoring: {str(e)}")
-                time.sleep(60)
+                delay = 60
+
+            # Wait for the next cycle, waking early when trades change
+            if self.stats_dirty.wait(delay) and self.is_running:
+                # Let a burst of new trades settle into a single refresh
+                time.sleep(self.MIN_UPDATE_INTERVAL)
 
     def update_pnl(self, stats, sheets=None):
         """Update PNL in both database and Google Sheets"""
@@ -272,7 +299,7 @@ class TradeManager:
                 }
 
                 for trade in self.active_trades:
-                    price_data = price_lookup.get(trade.contract_address.lower())
+                    price_data = price_lookup.get(trade.contract_key)
 
                     if price_data and price_data.get("price"):
                         current_price = price_data["price"]
@@ -318,6 +345,7 @@ class TradeManager:
                         if ath_updated:
                             trades_to_update.append(
                                 {
+                                    "trade_id": trade.trade_id,
                                     "ticker": trade.ticker,
                                     "contract_address": trade.contract_address,
                                     "ath_price": trade.ath_price,
@@ -349,7 +377,7 @@ class TradeManager:
                                 "ath_timestamp": trade.ath_timestamp.strftime(
                                     "%Y-%m-%d %H:%M:%S"
                                 ),
-                                "price_change": f"{price_change:.2f}%",
+                                "price_change_pct": price_change,
                                 "invested_amount": invested_amount,
                                 "current_value": current_value,
                                 "pnl_dollars": pnl,
@@ -408,6 +436,9 @@ class TradeManager:
             # Single update to PNL
             self.sync_pnl_updates(stats, sheets)
 
+            # Persist new ATHs and stop losses in one batched transaction
+            self.db.update_trade_aths(trades_to_update)
+
             # Update trades worksheet if needed
             if trades_to_update and self.sheets and "trades" in self.sheets:
                 from apexbt.sheets.sheets import update_trades_worksheet
@@ -424,30 +455,6 @@ class TradeManager:
             logger.error(f"Error updating trade prices: {str(e)}")
             logger.exception("Full traceback:")
 
-    def update_trade_ath_and_stop_loss(
-        self,
-        ticker: str,
-        contract_address: str,
-        ath_price: float,
-        ath_timestamp: datetime,
-        stop_loss: float,
-    ):
-        """Update ATH and stop loss values in database"""
-        try:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    UPDATE trades
-                    SET ath_price = ?, ath_timestamp = ?, stop_loss = ?
-                    WHERE ticker = ? AND contract_address = ? AND status = 'Open'
-                """,
-                    (ath_price, ath_timestamp, stop_loss, ticker, contract_address),
-                )
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Error updating trade ATH and stop loss: {str(e)}")
-
     def sync_pnl_updates(self, stats, sheets=None):
         """Sync PNL updates to both database and sheets"""
         try:
@@ -471,16 +478,19 @@ class TradeManager:
 
     def display_stats(self, stats):
         """Display current trading statistics using logger"""
-        logger.info("\nCurrent Trading Statistics:")
-        logger.info("-" * 120)
-
-        # Display individual trades with ATH and Stop Loss
-        logger.info("Individual Trades:")
-        logger.info(
+        # Build the whole report first and log it as one record, so a refresh
+        # costs one handler call and stays contiguous in the output
+        lines = [
+            "\nCurrent Trading Statistics:",
+            "-" * 120,
+            # Display individual trades with ATH and Stop Loss
+            "Individual Trades:",
             f"{'AI Agent':<12} {'Ticker':<10} {'Current':<12} {'ATH':<12} {'Stop Loss':<12} "
-            f"{'Entry':<12} {'Change':<8} {'From ATH':<8} {'To SL':<8} {'MC':<10}"
-        )
-        logger.info("-" * 120)
+            f"{'Entry':<12} {'Change':<8} {'From ATH':<8} {'To SL':<8} {'MC':<10}",
+            "-" * 120,
+        ]
+        agent_lines = []
+        total_lines = []
 
         for position in stats:
             if position["type"] == "trade":
@@ -500,41 +510,51 @@ class TradeManager:
                     else:
                         market_cap_str = f"${position['market_cap']:.2f}"
 
-                logger.info(
+                lines.append(
                     f"{position['ai_agent']:<12} "
                     f"{position['ticker']:<10} "
                     f"${current_price:<11.8f} "
                     f"${ath_price:<11.8f} "
                     f"${stop_loss:<11.8f} "
                     f"${position['entry_price']:<11.8f} "
-                    f"{position['price_change']:<8} "
+                    f"{position['price_change_pct']:>7.2f}% "
                     f"{from_ath:>7.2f}% "
                     f"{to_stop_loss:>7.2f}% "
                     f"{market_cap_str:<10}"
                 )
+            elif position["type"] == "agent_total":
+                agent_lines.append(
+                    f"{position['agent']}: ${position['pnl_dollars']:.2f}"
+                )
+            elif position["type"] == "grand_total":
+                total_lines.append(
+                    f"Total Portfolio PNL: ${position['pnl_dollars']:.2f}"
+                )
 
         # Display totals by agent
-        logger.info("\nAgent Totals:")
-        logger.info("-" * 40)
-        for position in stats:
-            if position["type"] == "agent_total":
-                logger.info(f"{position['agent']}: ${position['pnl_dollars']:.2f}")
+        lines.extend(["\nAgent Totals:", "-" * 40, *agent_lines])
 
         # Display grand total
-        logger.info("\nPortfolio Summary:")
-        logger.info("-" * 40)
-        for position in stats:
-            if position["type"] == "grand_total":
-                logger.info(f"Total Portfolio PNL: ${position['pnl_dollars']:.2f}")
-        logger.info("-" * 80)
+        lines.extend(["\nPortfolio Summary:", "-" * 40, *total_lines, "-" * 80])
+
+        logger.info("\n".join(lines))
 
     def get_current_stats(self):
         """Get current statistics from database"""
         try:
             with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM pnl ORDER BY ai_agent, ticker")
-                rows = cursor.fetchall()
+                # Server-side cursor so rows stream in itersize batches
+                cursor = conn.cursor(name="current_stats")
+                cursor.itersize = LOADER_ITERSIZE
+                cursor.execute(
+                    """
+                    SELECT ai_agent, ticker, contract_address, entry_time,
+                           entry_price, current_price, price_change_percentage,
+                           invested_amount, current_value, pnl
+                    FROM pnl
+                    ORDER BY ai_agent, ticker
+                """
+                )
 
                 stats = []
                 current_agent = None
@@ -544,20 +564,31 @@ class TradeManager:
                     "pnl_dollars": 0,
                 }
 
-                for row in rows:
+                for (
+                    ai_agent,
+                    ticker,
+                    contract_address,
+                    entry_time,
+                    entry_price,
+                    current_price,
+                    price_change_pct,
+                    invested_amount,
+                    current_value,
+                    pnl,
+                ) in cursor:
                     stats.append(
                         {
                             "type": "trade",
-                            "ai_agent": row["ai_agent"],
-                            "ticker": row["ticker"],
-                            "contract_address": row["contract_address"],
-                            "entry_time": row["entry_time"],
-                            "entry_price": row["entry_price"],
-                            "current_price": row["current_price"],
-                            "price_change": f"{row['price_change_percentage']:.2f}%",
-                            "invested_amount": row["invested_amount"],
-                            "current_value": row["current_value"],
-                            "pnl_dollars": row["pnl"],
+                            "ai_agent": ai_agent,
+                            "ticker": ticker,
+                            "contract_address": contract_address,
+                            "entry_time": entry_time,
+                            "entry_price": entry_price,
+                            "current_price": current_price,
+                            "price_change_pct": price_change_pct,
+                            "invested_amount": invested_amount,
+                            "current_value": current_value,
+                            "pnl_dollars": pnl,
                         }
                     )
 
@@ -567,16 +598,17 @@ class TradeManager:
             logger.error(f"Error getting current stats: {str(e)}")
             return []
 
+    def _refresh_open_trade_keys(self):
+        """Rebuild the open trade lookup from active_trades"""
+        self.open_trade_keys = {
+            (trade.ticker.lower(), trade.contract_key)
+            for trade in self.active_trades
+            if trade.status == "Open"
+        }
+
     def has_open_trade(self, ticker: str, contract_address: str) -> bool:
         """Check if there's already an open trade for the given ticker and contract"""
-        return any(
-            (
-                trade.ticker.lower() == ticker.lower()
-                and trade.contract_address.lower() == contract_address.lower()
-                and trade.status == "Open"
-            )
-            for trade in self.active_trades
-        )
+        return (ticker.lower(), contract_address.lower()) in self.open_trade_keys
 
     def add_trade(
         self,
@@ -589,8 +621,13 @@ class TradeManager:
         entry_timestamp: datetime = None,
         market_cap: float = None,
         holder_count: int = None,
+        batch: Optional[DatabaseBatch] = None,
     ) -> bool:
-        """Add a new trade, send notification and signal"""
+        """Add a new trade, send notification and signal
+
+        Pass batch to write the trade inside an open Database.batch()
+        transaction instead of committing it on its own.
+        """
         if self.has_open_trade(ticker, contract_address):
             logger.warning(
                 f"Trade for {ticker} ({contract_address}) already exists - skipping"
@@ -609,7 +646,7 @@ class TradeManager:
         stop_loss = ath_price * config.STOP_LOSS_PERCENTAGE
 
         trade_data = {
-            "trade_id": f"T{entry_timestamp.strftime('%Y%m%d%H%M%S%f')}",
+            "trade_id": _trade_id(entry_timestamp),
             "ai_agent": ai_agent,
             "timestamp": entry_timestamp,
             "ticker": ticker,
@@ -628,52 +665,71 @@ class TradeManager:
         }
 
         # Save to database
-        success = self.db.save_trade(trade_data)
+        saved_trade = (batch or self.db).save_trade(trade_data)
+        success = saved_trade is not None
 
         if success:
-            # Save to sheets if available
-            if self.sheets and "trades" in self.sheets:
-                from apexbt.sheets.sheets import save_trade as save_trade_to_sheets
+            logger.info(
+                f"Saved trade {saved_trade['trade_id']} for {ticker} "
+                f"at {saved_trade['entry_price']}"
+            )
 
-                save_trade_to_sheets(
-                    self.sheets["trades"], trade_data, self.sheets.get("pnl")
-                )
+            def open_position():
+                """Track the saved trade in memory, Sheets and the signal bot"""
+                # Save to sheets if available
+                if self.sheets and "trades" in self.sheets:
+                    from apexbt.sheets.sheets import save_trade as save_trade_to_sheets
+
+                    save_trade_to_sheets(
+                        self.sheets["trades"], trade_data, self.sheets.get("pnl")
+                    )
 
-            # Add to active trades
-            self.active_trades.append(
-                TradePosition(
-                    ticker=ticker,
-                    entry_price=entry_price,
-                    entry_timestamp=entry_timestamp,
-                    status="Open",
-                    ai_agent=ai_agent,
-                    contract_address=contract_address,
-                    network=network,
-                    market_cap=market_cap,
+                # Add to active trades
+                self.active_trades.append(
+                    TradePosition(
+                        ticker=ticker,
+                        entry_price=entry_price,
+                        # Match what load_active_trades returns after a restart
+                        entry_timestamp=saved_trade["timestamp"],
+                        status="Open",
+                        ai_agent=ai_agent,
+                        contract_address=contract_address,
+                        network=network,
+                        market_cap=market_cap,
+                        trade_id=saved_trade["trade_id"],
+                    )
                 )
-            )
+                self.open_trade_keys.add((ticker.lower(), contract_address.lower()))
+
+                # Only send signals if not historical
+                if not self.historical and self.signal_api:
+                    # Send signal to signal bot
+                    sniff_score = -1
+                    if ai_agent.lower() == "pump.fun":
+                        sniff_data = self.get_sniff_data(contract_address)
+                        sniff_score = sniff_data["sniffscore"]
+
+                    logger.info(f"Sending signal for {ticker} to signal bot...")
+                    signal_response = self.signal_api.send_signal(
+                        token=ticker,
+                        contract=contract_address,
+                        signal_from=ai_agent,
+                        chain=network,
+                        market_cap=market_cap,
+                        sniffscore=sniff_score,
+                        holder_count=holder_count,
+                        tx_type="buy",
+                        entry_price=entry_price,
+                    )
+                    logger.info(f"Signal API response: {signal_response}")
 
-            # Only send signals if not historical
-            if not self.historical and self.signal_api:
-                # Send signal to signal bot
-                sniff_score = -1
-                if ai_agent.lower() == "pump.fun":
-                    sniff_data = self.get_sniff_data(contract_address)
-                    sniff_score = sniff_data["sniffscore"]
+                self.stats_dirty.set()
 
-                logger.info(f"Sending signal for {ticker} to signal bot...")
-                signal_response = self.signal_api.send_signal(
-                    token=ticker,
-                    contract=contract_address,
-                    signal_from=ai_agent,
-                    chain=network,
-                    market_cap=market_cap,
-                    sniffscore=sniff_score,
-                    holder_count=holder_count,
-                    tx_type="buy",
-                    entry_price=entry_price,
-                )
-                logger.info(f"Signal API response: {signal_response}")
+            # In a batch the trade only exists once the transaction commits
+            if batch is not None:
+                batch.after_commit(open_position)
+            else:
+                open_position()
 
         return success
 
@@ -714,12 +770,15 @@ class TradeManager:
                 "notes": f"Trade closed due to {exit_reason}",
                 "max_drawdown": max_drawdown,
                 "max_profit": max_profit,
-                "ticker": trade.ticker,
-                "contract_address": trade.contract_address,
+                "trade_id": trade.trade_id,
             }
 
             # Update database with comprehensive exit information
-            self.db.update_trade_exit(trade_data)
+            closed_trade = self.db.update_trade_exit(trade_data)
+            if closed_trade is None:
+                logger.warning(
+                    f"No open trade {trade.trade_id} found in database for {trade.ticker}"
+                )
 
             if self.sheets and "trades" in self.sheets:
                 exit_data = {
@@ -737,10 +796,9 @@ class TradeManager:
 
             # Remove from active trades list
             self.active_trades = [
-                t
-                for t in self.active_trades
-                if t.contract_address != trade.contract_address
+                t for t in self.active_trades if t.contract_key != trade.contract_key
             ]
+            self._refresh_open_trade_keys()
 
             logger.info(
                 f"Exited trade for {trade.ticker} at ${exit_price:.8f}. "
@@ -1,4 +1,5 @@
 import logging
+import orjson
 import requests
 from typing import Dict, Optional, List
 from apexbt.config.config import config
@@ -61,7 +62,7 @@ class SignalAPI:
             )
 
             if response.status_code == 200:
-                response_data = response.json()
+                response_data = orjson.loads(response.content)
                 SignalAPI._auth_token = response_data.get("access_token")
                 # Update header with proper token format
                 self.session.headers.update(
@@ -153,7 +154,7 @@ class SignalAPI:
 
             if response.status_code == 200:
                 logger.info(f"Successfully sent signal for {token}")
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(
                     f"Failed to send signal. Status code: {response.status_code}. Response: {response.text}"
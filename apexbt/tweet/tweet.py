@@ -2,7 +2,9 @@
 import tweepy
 import logging
 import asyncio
+import random
 import re
+import threading
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from apexbt.config.config import config
@@ -11,6 +13,9 @@ import time
 from collections import deque
 from apexbt.database.database import Database
 
+# Cashtags such as $BTC; requiring a leading letter keeps out dollar amounts
+TICKER_PATTERN = re.compile(r"\$([A-Za-z][A-Za-z0-9]*)")
+
 
 class RateLimiter:
     def __init__(self, max_requests, time_window):
@@ -20,6 +25,8 @@ class RateLimiter:
         self.reset_time = None
         self.remaining_requests = None
         self.rate_limit_ceiling = None
+        # Held while waiting so threads sharing the limiter queue up in order
+        self.lock = threading.Lock()
 
     def update_from_headers(self, headers):
         """Update rate limit info from response headers"""
@@ -49,10 +56,41 @@ class RateLimiter:
                 )
                 await asyncio.sleep(wait_time)
 
+    def wait_for_reset(self):
+        """Block until the rate limit resets or the oldest request leaves the window"""
+        now = time.time()
+        if self.reset_time:
+            # The API's own reset time wins; once it has passed there is
+            # nothing to wait for
+            wait_time = self.reset_time - now
+            # The local history predates the API's new window
+            self.requests.clear()
+            self.reset_time = None
+        elif self.requests:
+            wait_time = self.requests[0] + self.time_window - now
+        else:
+            wait_time = 0
+        if wait_time > 0:
+            logger.info(f"Rate limit reached. Waiting {wait_time:.2f} seconds")
+            time.sleep(wait_time)
+        # Header counts from before the reset no longer apply
+        self.remaining_requests = None
+
+    def acquire(self):
+        """Block only as long as needed for the next request to fit the limit"""
+        with self.lock:
+            while not self.can_make_request():
+                self.wait_for_reset()
+
     def can_make_request(self):
-        """Check if we can make a request based on headers"""
+        """Check if we can make a request based on headers, claiming it if so"""
         if self.remaining_requests is not None:
-            return self.remaining_requests > 0
+            if self.remaining_requests <= 0:
+                return False
+            # Count the request now so concurrent pollers cannot all spend the
+            # same remaining slot before its response headers come back
+            self.remaining_requests -= 1
+            return True
 
         now = time.time()
         while self.requests and self.requests[0] < now - self.time_window:
@@ -88,6 +126,8 @@ class TwitterManager:
         self.bearer_token = config.TWITTER_BEARER_TOKEN
         self.client = self._setup_client()
         self.running = True
+        # Shared by every historical fetch, including concurrent ones
+        self.timeline_limiter = RateLimiter(max_requests=900, time_window=15 * 60)
 
     def _setup_client(self) -> tweepy.Client:
         """Initialize Twitter API client"""
@@ -126,19 +166,19 @@ class TwitterManager:
     @staticmethod
     def extract_ticker(tweet_text: str) -> Tuple[Optional[str], str]:
         """Extract ticker from tweet text, ignoring dollar amounts"""
-        dollar_matches = re.finditer(r"\$([A-Za-z0-9]+)", tweet_text, re.IGNORECASE)
+        # Most tweets carry no cashtag at all; skip the regex for them
+        if "$" not in tweet_text:
+            return None, "No ticker"
 
-        tickers = []
-        for match in dollar_matches:
-            if not match.group(1)[0].isdigit():
-                tickers.append(match.group(1))
+        ticker = None
+        for match in TICKER_PATTERN.finditer(tweet_text):
+            if ticker is not None:
+                return None, "Multiple tickers"
+            ticker = match.group(1)
 
-        if len(tickers) == 0:
+        if ticker is None:
             return None, "No ticker"
-        elif len(tickers) > 1:
-            return None, "Multiple tickers"
-        else:
-            return tickers[0].upper(), "Single ticker"
+        return ticker.upper(), "Single ticker"
 
     async def monitor(
         self,
@@ -174,57 +214,20 @@ class TwitterManager:
             logger.info(f"Starting monitoring iteration {monitoring_iteration}")
 
             try:
-                for username, user_id in user_ids.items():
-                    if not self.running:
-                        break
-
-                    logger.info(f"Checking tweets for @{username}")
-                    try:
-                        if not rate_limiter.can_make_request():
-                            await rate_limiter.wait_for_reset_async()
-
-                        response = self.client.get_users_tweets(
-                            id=user_id,
-                            tweet_fields=["created_at", "referenced_tweets"],
-                            since_id=latest_tweet_ids[username],
-                            max_results=10,
-                            exclude=["replies"],
-                        )
-
-                        if hasattr(response, "headers"):
-                            rate_limiter.update_from_headers(response.headers)
-
-                        if response.data:
-                            latest_tweet_ids[username] = response.data[0].id
-
-                            for tweet in response.data:
-                                if (
-                                    hasattr(tweet, "referenced_tweets")
-                                    and tweet.referenced_tweets
-                                ):
-                                    continue
-
-                                mock_tweet = MockTweet(
-                                    id=tweet.id,
-                                    text=tweet.text,
-                                    created_at=tweet.created_at,
-                                    author=username,
-                                )
-                                await callback(mock_tweet)
-
-                        await asyncio.sleep(15)  # Wait between users
-
-                    except tweepy.errors.TooManyRequests as e:
-                        logger.warning(f"Rate limit exceeded for @{username}")
-                        if hasattr(e, "response") and e.response is not None:
-                            rate_limiter.update_from_headers(e.response.headers)
-                        await rate_limiter.wait_for_reset_async()
-                        continue
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing tweets for @{username}: {str(e)}"
+                # Poll every user at once; the shared limiter still paces the
+                # requests, but one slow response no longer holds up the rest
+                await asyncio.gather(
+                    *(
+                        self._poll_user(
+                            username,
+                            user_id,
+                            latest_tweet_ids,
+                            rate_limiter,
+                            callback,
                         )
-                        continue
+                        for username, user_id in user_ids.items()
+                    )
+                )
 
                 logger.info(f"Completed iteration {monitoring_iteration}")
                 await asyncio.sleep(delay)
@@ -233,13 +236,67 @@ class TwitterManager:
                 logger.error(f"Critical error in monitoring loop: {str(e)}")
                 await asyncio.sleep(delay)
 
+    async def _poll_user(
+        self,
+        username: str,
+        user_id: int,
+        latest_tweet_ids: dict,
+        rate_limiter: RateLimiter,
+        callback: Callable[[MockTweet], Any],
+    ):
+        """Fetch one user's new original tweets and pass each to the callback"""
+        if not self.running:
+            return
+
+        logger.info(f"Checking tweets for @{username}")
+        try:
+            # Pace on the limiter and the API's rate limit headers rather than
+            # a fixed pause after every user, and keep the blocking calls off
+            # the event loop
+            await asyncio.to_thread(rate_limiter.acquire)
+
+            response = await asyncio.to_thread(
+                self.client.get_users_tweets,
+                id=user_id,
+                tweet_fields=["created_at", "referenced_tweets"],
+                since_id=latest_tweet_ids[username],
+                max_results=10,
+                exclude=["replies"],
+            )
+
+            if hasattr(response, "headers"):
+                rate_limiter.update_from_headers(response.headers)
+
+            if response.data:
+                latest_tweet_ids[username] = response.data[0].id
+
+                for tweet in response.data:
+                    if hasattr(tweet, "referenced_tweets") and tweet.referenced_tweets:
+                        continue
+
+                    mock_tweet = MockTweet(
+                        id=tweet.id,
+                        text=tweet.text,
+                        created_at=tweet.created_at,
+                        author=username,
+                    )
+                    await callback(mock_tweet)
+
+        except tweepy.errors.TooManyRequests as e:
+            logger.warning(f"Rate limit exceeded for @{username}")
+            if hasattr(e, "response") and e.response is not None:
+                rate_limiter.update_from_headers(e.response.headers)
+            await rate_limiter.wait_for_reset_async()
+        except Exception as e:
+            logger.error(f"Error processing tweets for @{username}: {str(e)}")
+
     def fetch_historical_tweets(
         self, username: str, start_date: datetime
     ) -> List[MockTweet]:
         """Fetch historical tweets (excluding replies) from a specific user since start_date"""
         historical_tweets = []
         user_id = self.get_user_id(username)
-        rate_limiter = RateLimiter(max_requests=900, time_window=15 * 60)
+        rate_limiter = self.timeline_limiter
 
         if not user_id:
             logger.error(f"Could not find user ID for {username}")
@@ -257,18 +314,12 @@ class TwitterManager:
         pagination_token = None
         batch_count = 0
         total_requests = 0
+        failed_attempts = 0
 
         while True:
             try:
-                # Check rate limits before making request
-                if not rate_limiter.can_make_request():
-                    logger.info("Rate limit check failed, waiting for reset...")
-                    rate_limiter.wait_for_reset()
-
-                base_delay = 5
-                batch_delay = min(base_delay + (batch_count * 2), 30)
-                logger.info(f"Waiting {batch_delay} seconds before next request...")
-                time.sleep(batch_delay)
+                # Wait only when the request would exceed the rate limit
+                rate_limiter.acquire()
 
                 tweets = self.client.get_users_tweets(
                     id=user_id,
@@ -287,6 +338,7 @@ class TwitterManager:
                     rate_limiter.update_from_headers(tweets.headers)
 
                 total_requests += 1
+                failed_attempts = 0
                 logger.info(f"Made {total_requests} requests for @{username}")
 
                 if not tweets.data:
@@ -337,12 +389,17 @@ class TwitterManager:
                 if hasattr(e, "response") and e.response is not None:
                     logger.info("Updating rate limit info from error response")
                     rate_limiter.update_from_headers(e.response.headers)
-                rate_limiter.wait_for_reset()
+                with rate_limiter.lock:
+                    rate_limiter.wait_for_reset()
+                # Jitter so concurrent fetches do not all retry at once
+                time.sleep(random.random())
                 continue
 
             except Exception as e:
                 logger.error(f"Error fetching tweets for @{username}: {str(e)}")
-                time.sleep(60)  # Basic error backoff
+                # Exponential backoff with jitter, capped at the old flat 60s
+                time.sleep(min(2**failed_attempts + random.random(), 60))
+                failed_attempts += 1
                 continue
 
         logger.info(
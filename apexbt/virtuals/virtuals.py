@@ -18,15 +18,19 @@ class VirtualsManager:
         logger.info("Starting Virtuals monitoring...")
         self.running = True
 
-        while self.running:
-            try:
-                await self.process_new_tokens()
-                await asyncio.sleep(self.check_interval)
-            except Exception as e:
-                logger.error(f"Error in Virtuals monitoring loop: {str(e)}")
-                await asyncio.sleep(
-                    self.check_interval
-                )  # Still sleep on error to prevent tight loop
+        try:
+            while self.running:
+                try:
+                    await self.process_new_tokens()
+                    await asyncio.sleep(self.check_interval)
+                except Exception as e:
+                    logger.error(f"Error in Virtuals monitoring loop: {str(e)}")
+                    await asyncio.sleep(
+                        self.check_interval
+                    )  # Still sleep on error to prevent tight loop
+        finally:
+            # Runs on stop and on cancellation, while the loop is still alive
+            await self.sdk_client.close()
 
     def stop(self):
         """Stop the monitoring process"""
@@ -62,13 +66,11 @@ class VirtualsManager:
     async def process_new_tokens(self):
         """Process new virtual tokens"""
         try:
-            # Get both sentient and prototype listings
-            sentient_result = self.sdk_client.get_sentient_listing()
+            # Get new tokens from the sentient listing
+            new_tokens = await self.sdk_client.fetch_all_new(token_types=("sentient",))
 
-            # Process new tokens from both listings
-            for token_list in [
-                sentient_result.get("tokens", []),
-            ]:
+            # Process new tokens from each listing
+            for token_list in new_tokens.values():
                 for token in token_list:
                     token_info = self._create_token_info(token)
 
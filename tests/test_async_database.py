@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime
+
+from apexbt.database.async_database import AsyncDatabase, _decode_timestamp
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeConnection:
+    """Connection whose insert fails for the tweet id "bad" """
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def fetchval(self, sql, tweet_id, *params):
+        if tweet_id == "bad":
+            raise ValueError("bad row")
+        return tweet_id
+
+
+class FakeAcquire:
+    async def __aenter__(self):
+        return FakeConnection()
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakePool:
+    def acquire(self):
+        return FakeAcquire()
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.recorded = []
+
+    def _record_saved_tweet(self, ai_agent, tweet_id, inserted):
+        self.recorded.append((ai_agent, tweet_id, inserted))
+
+
+def test_save_tweets_batch_resolves_failing_and_passing_rows():
+    async def run():
+        db = FakeDatabase()
+        async_db = AsyncDatabase(db)
+        async_db.pool = FakePool()
+        loop = asyncio.get_running_loop()
+        bad, good = loop.create_future(), loop.create_future()
+
+        await async_db.save_tweets_batch(
+            [(("bad",), "agent", bad), (("good",), "agent", good)]
+        )
+
+        assert bad.done() and bad.result() is False
+        assert good.done() and good.result() is True
+        # Only the committed row reaches the processed-tweet cache
+        assert db.recorded == [("agent", "good", True)]
+
+    asyncio.run(run())
+
+
+def test_decode_timestamp():
+    assert _decode_timestamp("2025-02-01 09:05:03") == datetime(2025, 2, 1, 9, 5, 3)
+    assert _decode_timestamp("2025-02-01 09:05:03.123456") == datetime(
+        2025, 2, 1, 9, 5, 3, 123456
+    )
+
+
+def test_decode_timestamp_trimmed_fraction():
+    # The server drops trailing zeros, which older fromisoformat rejects
+    assert _decode_timestamp("2025-02-01 09:05:03.5") == datetime(
+        2025, 2, 1, 9, 5, 3, 500000
+    )
@@ -0,0 +1,12 @@
+from apexbt.database.database import numbered_placeholders
+
+
+def test_numbered_placeholders():
+    assert (
+        numbered_placeholders("INSERT INTO t (a, b, c) VALUES (%s, %s, %s)")
+        == "INSERT INTO t (a, b, c) VALUES ($1, $2, $3)"
+    )
+
+
+def test_numbered_placeholders_without_params():
+    assert numbered_placeholders("SELECT 1") == "SELECT 1"
@@ -0,0 +1,45 @@
+from apexbt.crypto.dexscreener import MarketSnapshot
+
+
+def test_market_snapshot_from_pair():
+    snapshot = MarketSnapshot.from_pair(
+        {
+            "chainId": "solana",
+            "dexId": "raydium",
+            "pairAddress": "pair123",
+            "baseToken": {"address": "token123", "name": "Goat", "symbol": "GOAT"},
+            "quoteToken": {"symbol": "SOL"},
+            "priceUsd": "0.5",
+            "volume": {"h24": 1000},
+            "liquidity": {"usd": "2500.5"},
+            "priceChange": {"h24": -3.2},
+            "marketCap": 500000,
+            "fdv": 600000,
+            "pairCreatedAt": 1700000000000,
+        }
+    )
+
+    assert snapshot.current_price == 0.5
+    assert snapshot.volume_24h == 1000.0
+    assert snapshot.liquidity == 2500.5
+    assert snapshot.percent_change_24h == -3.2
+    assert snapshot.market_cap == 500000.0
+    assert snapshot.fdv == 600000.0
+    assert snapshot.dex == "raydium"
+    assert snapshot.network == "solana"
+    assert snapshot.pair_name == "GOAT/SOL"
+    assert snapshot.last_updated == 1700000000000
+    assert snapshot.pair_address == "pair123"
+    assert snapshot.contract_address == "token123"
+    assert snapshot.token_name == "Goat"
+    assert snapshot.token_symbol == "GOAT"
+
+
+def test_market_snapshot_from_pair_defaults_missing_numbers():
+    snapshot = MarketSnapshot.from_pair({"priceUsd": None, "marketCap": None})
+
+    assert snapshot.current_price == 0.0
+    assert snapshot.volume_24h == 0.0
+    assert snapshot.liquidity == 0.0
+    assert snapshot.market_cap == 0.0
+    assert snapshot.contract_address is None
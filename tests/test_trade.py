@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from apexbt.trade.trade import _trade_id
+
+
+def test_trade_id_matches_strftime_format():
+    for dt in (
+        datetime(2025, 2, 1, 9, 5, 3, 42),
+        datetime(2024, 12, 31, 23, 59, 59, 999999),
+        datetime(2025, 1, 1),
+    ):
+        assert _trade_id(dt) == dt.strftime("T%Y%m%d%H%M%S%f")
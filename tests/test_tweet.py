@@ -0,0 +1,33 @@
+from apexbt.tweet.tweet import TwitterManager
+
+extract_ticker = TwitterManager.extract_ticker
+
+
+def test_extract_ticker_single():
+    assert extract_ticker("$btc is up 5% today") == ("BTC", "Single ticker")
+
+
+def test_extract_ticker_ignores_dollar_amounts():
+    assert extract_ticker("$100 $btc") == ("BTC", "Single ticker")
+    assert extract_ticker("$WBTC is trading at $70m mcap") == (
+        "WBTC",
+        "Single ticker",
+    )
+
+
+def test_extract_ticker_keeps_trailing_digits():
+    assert extract_ticker("$btc2 looks strong") == ("BTC2", "Single ticker")
+
+
+def test_extract_ticker_multiple():
+    assert extract_ticker("$a $b") == (None, "Multiple tickers")
+    assert extract_ticker("$max (+258%), $kween (+47%), $lum (-25%)") == (
+        None,
+        "Multiple tickers",
+    )
+
+
+def test_extract_ticker_none():
+    assert extract_ticker("no cashtag here") == (None, "No ticker")
+    assert extract_ticker("raised $100 at $5m") == (None, "No ticker")
+    assert extract_ticker("") == (None, "No ticker")